@@ -1,4 +1,16 @@
-import random   # Biblioteca padrão para geração de números aleatórios
+import csv
+import heapq
+import json
+import sys
+from array import array
+from collections import OrderedDict
+import numpy as np
+from GeradorAleatorio import GeradorAleatorio, GERADOR_PADRAO
+
+# Operadores de seleção
+ROLETA = 'roleta'    # roleta proporcional ao fitness
+SUS = 'sus'          # amostragem universal estocástica
+TORNEIO = 'torneio'  # torneio de k indivíduos
 
 # ---------------- Classe Produto ----------------
 class Produto:
@@ -9,83 +21,375 @@ class Produto:
         self.valor = valor      # Valor do produto (benefício a ser maximizado)
 
 
+# ---------------- Classe ProblemaMochila ----------------
+class ProblemaMochila:
+    # Dados do problema, criados uma vez e compartilhados (sem cópia) por
+    # todos os indivíduos da execução. Imutável depois de criado.
+    __slots__ = ("espacos", "valores", "limiteEspacos", "ordemRazao")
+
+    def __init__(self, espacos, valores, limiteEspacos):
+        espacos = np.asarray(espacos, dtype=float)
+        valores = np.asarray(valores, dtype=float)
+        object.__setattr__(self, "espacos", tuple(espacos.tolist()))  # Espaço de cada produto
+        object.__setattr__(self, "valores", tuple(valores.tolist()))  # Valor de cada produto
+        object.__setattr__(self, "limiteEspacos", limiteEspacos) # Capacidade máxima
+        # Índices dos produtos da pior para a melhor razão valor/espaço
+        # (produtos sem espaço têm razão infinita)
+        razao = np.divide(valores, espacos, out=np.full(len(espacos), np.inf),
+                          where=espacos > 0)
+        object.__setattr__(self, "ordemRazao",
+                           tuple(np.argsort(razao, kind="stable").tolist()))
+
+    def __setattr__(self, nome, valor):
+        raise AttributeError("ProblemaMochila é imutável")
+
+    def __len__(self):
+        return len(self.espacos)
+
+
 # ---------------- Classe Individuo ----------------
 class Individuo:
-    def __init__(self, espacos, valores, limiteEspacos):
+    # __slots__: sem __dict__ por indivíduo (menos memória e alocação)
+    __slots__ = ("problema", "rng", "notaAvaliacao", "espacoUsado",
+                 "valorTotal", "geracao", "cromossomo")
+
+    def __init__(self, problema, rng=None, cromossomo=None, geracao=0):
         # Cada indivíduo é uma possível solução (cromossomo) do problema
-        self.espacos = espacos              # Lista com espaços de todos os produtos
-        self.valores = valores              # Lista com valores de todos os produtos
-        self.limiteEspacos = limiteEspacos  # Capacidade máxima permitida
+        self.problema = problema            # ProblemaMochila compartilhado
+        self.rng = rng if rng is not None else GERADOR_PADRAO  # Gerador aleatório
         self.notaAvaliacao = 0.0            # Fitness do indivíduo (valor total da solução)
         self.espacoUsado = 0.0              # Espaço total consumido pelos itens escolhidos
-        self.geracao = 0                    # Geração em que o indivíduo foi criado
-        self.cromossomo = []                # Vetor binário de 0/1 indicando se item foi escolhido
-        self.criacao()                      # Inicializa o cromossomo aleatoriamente
+        self.valorTotal = None              # Soma dos valores sem penalidade (None = não avaliado)
+        self.geracao = geracao              # Geração em que o indivíduo foi criado
+        if cromossomo is None:
+            self.criacao()                  # Inicializa o cromossomo aleatoriamente
+        else:
+            self.cromossomo = cromossomo    # Vetor binário de "0"/"1" já pronto (filhos)
+
+    # Acesso aos dados do problema compartilhado
+    @property
+    def espacos(self):
+        return self.problema.espacos
+
+    @property
+    def valores(self):
+        return self.problema.valores
+
+    @property
+    def limiteEspacos(self):
+        return self.problema.limiteEspacos
 
     def criacao(self):
         # Inicializa cromossomo aleatório: cada gene tem 50% de chance de ser 1
-        self.cromossomo = ["1" if random.random() < 0.5
-                           else "0" for _ in self.espacos]
+        sorteios = self.rng.randoms(len(self.espacos)).tolist()
+        self.cromossomo = ["1" if r < 0.5 else "0" for r in sorteios]
 
     def avaliacao(self):
         # Calcula a "aptidão" do indivíduo
-        nota = 0.0
+        problema = self.problema
+        somaValores = 0.0
         somaEspacos = 0.0
-        for i in range(len(self.cromossomo)):
-            if self.cromossomo[i] == "1":     # Se o gene for "1", produto é incluído
-                nota += self.valores[i]       # Soma valor do produto
-                somaEspacos += self.espacos[i]# Soma espaço do produto
-
-        if somaEspacos > self.limiteEspacos:  # Se ultrapassar o limite, aplica penalidade
-            nota = 1.0
+        for gene, valor, espaco in zip(self.cromossomo, problema.valores,
+                                       problema.espacos):
+            if gene == "1":                   # Se o gene for "1", produto é incluído
+                somaValores += valor          # Soma valor do produto
+                somaEspacos += espaco         # Soma espaço do produto
 
-        self.notaAvaliacao = nota             # Armazena valor final (fitness)
+        self.valorTotal = somaValores         # Soma dos valores (antes da penalidade)
         self.espacoUsado = somaEspacos        # Armazena espaço usado
+        self.aplicaPenalidade()
+
+    def aplicaPenalidade(self):
+        # Nota a partir das somas: se ultrapassar o limite, aplica penalidade
+        if self.espacoUsado > self.problema.limiteEspacos:
+            self.notaAvaliacao = 1.0
+        else:
+            self.notaAvaliacao = self.valorTotal
+
+    def diferencaParcial(self, outro, inicio, fim):
+        # (valor, espaço) deste indivíduo menos os do outro, só nos genes
+        # [inicio, fim); percorre o trecho mas só soma onde os genes diferem
+        problema = self.problema
+        a, b = self.cromossomo, outro.cromossomo
+        difValor = difEspaco = 0.0
+        for i in range(inicio, fim):
+            if a[i] != b[i]:
+                if a[i] == "1":
+                    difValor += problema.valores[i]
+                    difEspaco += problema.espacos[i]
+                else:
+                    difValor -= problema.valores[i]
+                    difEspaco -= problema.espacos[i]
+        return difValor, difEspaco
 
     def crossover(self, outro):
         # Realiza crossover (recombinação) com outro indivíduo
-        corte = round(random.random() * len(self.cromossomo)) # Ponto de corte
+        n = len(self.cromossomo)
+        corte = round(self.rng.random() * n)                    # Ponto de corte
         filho1 = outro.cromossomo[:corte] + self.cromossomo[corte:] # Combina prefixo/sufixo
         filho2 = self.cromossomo[:corte] + outro.cromossomo[corte:]
 
-        # Cria filhos como novos indivíduos
-        f1 = Individuo(self.espacos, self.valores, self.limiteEspacos)
-        f1.cromossomo = filho1
-        f1.geracao = self.geracao + 1
-
-        f2 = Individuo(self.espacos, self.valores, self.limiteEspacos)
-        f2.cromossomo = filho2
-        f2.geracao = self.geracao + 1
-
+        # Cria filhos como novos indivíduos (sem sortear cromossomo aleatório)
+        f1 = Individuo(self.problema, self.rng, filho1, self.geracao + 1)
+        f2 = Individuo(self.problema, self.rng, filho2, self.geracao + 1)
+
+        # Com os pais avaliados, as somas dos filhos saem das somas dos pais
+        # corrigidas pelo trecho trocado (o mais curto: prefixo ou sufixo)
+        if self.valorTotal is not None and outro.valorTotal is not None:
+            if corte <= n - corte:
+                # filho1 = self com o prefixo do outro; filho2 = o contrário
+                dv, de = self.diferencaParcial(outro, 0, corte)
+                base1, base2, dv, de = self, outro, -dv, -de
+            else:
+                # filho1 = outro com o sufixo de self; filho2 = o contrário
+                dv, de = self.diferencaParcial(outro, corte, n)
+                base1, base2 = outro, self
+            f1.valorTotal = base1.valorTotal + dv
+            f1.espacoUsado = base1.espacoUsado + de
+            f2.valorTotal = base2.valorTotal - dv
+            f2.espacoUsado = base2.espacoUsado - de
+            f1.aplicaPenalidade()
+            f2.aplicaPenalidade()
         return [f1, f2]
 
     def mutacao(self, taxaMutacao):
-        # Aplica mutação em cada gene do cromossomo
-        for i in range(len(self.cromossomo)):
-            if random.random() < taxaMutacao: # Se cair dentro da taxa de mutação
-                # Inverte o gene: 0 -> 1 ou 1 -> 0
-                self.cromossomo[i] = "0" if self.cromossomo[i] == "1" else "1"
-        return self
+        # Aplica mutação em cada gene do cromossomo (um sorteio em lote) e
+        # retorna as posições invertidas. Se o indivíduo já foi avaliado, as
+        # somas são atualizadas só nessas posições (O(genes mutados)).
+        sorteios = self.rng.randoms(len(self.cromossomo))
+        posicoes = np.flatnonzero(sorteios < taxaMutacao).tolist() # Genes dentro da taxa
+        avaliado = self.valorTotal is not None
+        problema = self.problema
+        for i in posicoes:
+            # Inverte o gene: 0 -> 1 ou 1 -> 0
+            if self.cromossomo[i] == "1":
+                self.cromossomo[i] = "0"
+                if avaliado:
+                    self.valorTotal -= problema.valores[i]
+                    self.espacoUsado -= problema.espacos[i]
+            else:
+                self.cromossomo[i] = "1"
+                if avaliado:
+                    self.valorTotal += problema.valores[i]
+                    self.espacoUsado += problema.espacos[i]
+        if avaliado and posicoes:
+            self.aplicaPenalidade()
+        return posicoes
+
+    def reparo(self):
+        # Remove os produtos de pior razão valor/espaço até a solução caber
+        # na mochila (requer o indivíduo avaliado). Retorna os genes removidos.
+        problema = self.problema
+        removidos = []
+        if self.espacoUsado <= problema.limiteEspacos:
+            return removidos
+        for i in problema.ordemRazao:
+            if self.cromossomo[i] == "1":
+                self.cromossomo[i] = "0"
+                self.valorTotal -= problema.valores[i]
+                self.espacoUsado -= problema.espacos[i]
+                removidos.append(i)
+                if self.espacoUsado <= problema.limiteEspacos:
+                    break
+        self.aplicaPenalidade()
+        return removidos
+
+
+# ---------------- Cache de fitness por cromossomo ----------------
+class CacheFitness:
+    # Memoriza (notaAvaliacao, espacoUsado) de cada cromossomo já avaliado.
+    # Quando a população converge, a maioria dos indivíduos são cópias de
+    # poucos cromossomos e deixam de ser reavaliados. A chave é o cromossomo
+    # como inteiro binário (int("0110...", 2)), bem menor que a lista de
+    # genes. O tamanho é limitado e a entrada usada há mais tempo é
+    # descartada (LRU). Uma instância vale para um único problema.
+    # Só passam pelo cache indivíduos que de fato seriam avaliados: filhos
+    # já pontuados de forma incremental não consultam nem contam falha.
+
+    def __init__(self, tamanho_max=100000):
+        self.tamanho_max = tamanho_max
+        self.valores = OrderedDict()   # chave -> (nota, espaço, valor total)
+        self.acertos = 0               # avaliações economizadas
+        self.falhas = 0                # avaliações realmente feitas
+
+    @staticmethod
+    def chave(cromossomo):
+        return int("".join(cromossomo), 2)
+
+    def busca(self, individuo):
+        # Preenche nota e espaço do indivíduo se o cromossomo já foi visto
+        chave = self.chave(individuo.cromossomo)
+        resultado = self.valores.get(chave)
+        if resultado is None:
+            return False
+        self.valores.move_to_end(chave)
+        self.acertos += 1
+        (individuo.notaAvaliacao, individuo.espacoUsado,
+         individuo.valorTotal) = resultado
+        return True
+
+    def guarda(self, individuo):
+        # Registra um indivíduo que acabou de ser avaliado (uma falha)
+        self.falhas += 1
+        chave = self.chave(individuo.cromossomo)
+        self.valores[chave] = (individuo.notaAvaliacao, individuo.espacoUsado,
+                               individuo.valorTotal)
+        self.valores.move_to_end(chave)
+        if len(self.valores) > self.tamanho_max:
+            self.valores.popitem(last=False)  # descarta o menos usado
+
+    def avalia(self, individuo):
+        # Preenche nota e espaço do indivíduo, avaliando só se necessário
+        if not self.busca(individuo):
+            individuo.avaliacao()
+            self.guarda(individuo)
+
+    def taxa_acerto(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def __repr__(self):
+        return (f"CacheFitness(entradas={len(self.valores)}, "
+                f"acertos={self.acertos}, falhas={self.falhas}, "
+                f"taxa={self.taxa_acerto():.1%})")
+
+
+# ---------------- Operadores de seleção ----------------
+# Cada operador recebe o array de notas da população e devolve, de uma vez,
+# os índices de 'quantidade' pais.
+
+def selecaoRoleta(notas, quantidade, rng):
+    # Roleta: soma acumulada das notas + busca binária de cada sorteio
+    # (O(N + quantidade * log N) em vez de uma varredura por pai)
+    acumulado = np.cumsum(notas)
+    sorteios = rng.randoms(quantidade) * acumulado[-1]
+    indices = np.searchsorted(acumulado, sorteios, side="left")
+    return np.minimum(indices, len(notas) - 1)
+
+def selecaoSUS(notas, quantidade, rng):
+    # Amostragem universal estocástica: 'quantidade' ponteiros igualmente
+    # espaçados sobre a roleta, com um único sorteio de deslocamento.
+    # Os pais saem embaralhados para que os pares não sigam a ordem da roleta.
+    acumulado = np.cumsum(notas)
+    passo = acumulado[-1] / quantidade
+    ponteiros = rng.random() * passo + passo * np.arange(quantidade)
+    indices = np.minimum(np.searchsorted(acumulado, ponteiros, side="left"),
+                         len(notas) - 1)
+    return rng.gerador.permutation(indices)
+
+def selecaoTorneio(notas, quantidade, rng, k=3):
+    # Torneio: para cada pai sorteia k competidores e fica com o de maior nota
+    competidores = rng.gerador.integers(0, len(notas), size=(quantidade, k))
+    vencedores = np.argmax(notas[competidores], axis=1)
+    return competidores[np.arange(quantidade), vencedores]
+
+def selecionaIndices(selecao, notas, quantidade, rng, tamanhoTorneio=3):
+    # Aplica o operador de seleção escolhido (ROLETA, SUS ou TORNEIO)
+    if selecao == SUS:
+        return selecaoSUS(notas, quantidade, rng)
+    if selecao == TORNEIO:
+        return selecaoTorneio(notas, quantidade, rng, tamanhoTorneio)
+    return selecaoRoleta(notas, quantidade, rng)
 
 
 # ---------------- Classe Algoritmo Genético ----------------
 class AlgoritmoGenetico:
-    def __init__(self, tamanhoPopulacao):
+    def __init__(self, tamanhoPopulacao, semente=None, selecao=ROLETA,
+                 tamanhoTorneio=3, elitismo=0, cache=None, fracaoGulosa=0.0,
+                 reparo=False, avaliador=None):
         self.tamanhoPopulacao = tamanhoPopulacao # Número de indivíduos
+        self.rng = GeradorAleatorio(semente)     # Gerador aleatório da execução
+        self.selecao = selecao                   # ROLETA, SUS ou TORNEIO
+        self.tamanhoTorneio = tamanhoTorneio     # k do torneio
+        self.elitismo = elitismo                 # Melhores mantidos a cada geração
+        self.cache = cache                       # CacheFitness opcional
+        self.fracaoGulosa = fracaoGulosa         # Parte da população inicial gulosa
+        self.reparo = reparo                     # Repara soluções acima do limite
+        self.avaliador = avaliador               # Avaliador em lote opcional
         self.populacao = []                      # Lista da população atual
         self.melhorSolucao = None                # Guarda o melhor indivíduo já encontrado
+        self.problema = None                     # ProblemaMochila da execução
 
     def inicializaPopulacao(self, espacos, valores, limiteEspacos):
-        # Cria população inicial com indivíduos aleatórios
-        self.populacao = [Individuo(espacos, valores, limiteEspacos)
-                          for _ in range(self.tamanhoPopulacao)]
+        # Cria o problema (compartilhado) e a população inicial: uma fração
+        # 'fracaoGulosa' de soluções gulosas e o restante aleatório
+        self.problema = ProblemaMochila(espacos, valores, limiteEspacos)
+        gulosos = min(self.tamanhoPopulacao,
+                      round(self.fracaoGulosa * self.tamanhoPopulacao))
+        # A primeira solução gulosa é a pura; as demais usam razões com ruído
+        self.populacao = [self.solucaoGulosa(0.0 if i == 0 else 0.3)
+                          for i in range(gulosos)]
+        self.populacao += [Individuo(self.problema, self.rng)
+                           for _ in range(self.tamanhoPopulacao - gulosos)]
         self.melhorSolucao = self.populacao[0]
 
+    def solucaoGulosa(self, ruido=0.0):
+        # Enche a mochila pela maior razão valor/espaço; com ruído > 0 as
+        # razões são multiplicadas por exp(N(0, ruido)), variando a solução
+        problema = self.problema
+        espacos = np.asarray(problema.espacos)
+        razao = np.divide(np.asarray(problema.valores), espacos,
+                          out=np.full(len(espacos), np.inf), where=espacos > 0)
+        if ruido > 0:
+            razao = razao * np.exp(self.rng.gerador.normal(0.0, ruido, len(razao)))
+        cromossomo = ["0"] * len(espacos)
+        somaValores = somaEspacos = 0.0
+        for i in np.argsort(-razao, kind="stable").tolist():
+            if somaEspacos + problema.espacos[i] <= problema.limiteEspacos:
+                cromossomo[i] = "1"
+                somaValores += problema.valores[i]
+                somaEspacos += problema.espacos[i]
+        individuo = Individuo(problema, self.rng, cromossomo)
+        individuo.valorTotal = somaValores
+        individuo.espacoUsado = somaEspacos
+        individuo.aplicaPenalidade()
+        return individuo
+
     def ordenaPopulacao(self):
         # Ordena população em ordem decrescente de aptidão (fitness)
         self.populacao.sort(key=lambda ind: ind.notaAvaliacao,
                             reverse=True)
 
+    def avaliaLote(self, individuos):
+        # Avalia uma lista de indivíduos, passando pelo cache quando houver.
+        # Com avaliador (Avaliador.py), todos os que faltam vão num único
+        # lote e f(cromossomo[, dados]) retorna (valorTotal, espacoUsado);
+        # sem avaliador, filhos já pontuados por crossover/mutação
+        # incrementais não são reavaliados.
+        if self.avaliador is None:
+            pendentes = [ind for ind in individuos if ind.valorTotal is None]
+        else:
+            pendentes = list(individuos)
+        if self.cache is not None:
+            pendentes = [ind for ind in pendentes if not self.cache.busca(ind)]
+        if self.avaliador is not None:
+            resultados = self.avaliador.avalia([ind.cromossomo for ind in pendentes])
+            for ind, (valorTotal, espacoUsado) in zip(pendentes, resultados):
+                ind.valorTotal = valorTotal
+                ind.espacoUsado = espacoUsado
+                ind.aplicaPenalidade()
+        else:
+            for ind in pendentes:
+                ind.avaliacao()
+        if self.cache is not None:
+            for ind in pendentes:
+                self.cache.guarda(ind)
+        if self.reparo:
+            for ind in individuos:
+                ind.reparo()
+
+    def melhorDaGeracao(self):
+        # Melhor indivíduo da população atual, em O(N) (sem ordenar)
+        return max(self.populacao, key=lambda ind: ind.notaAvaliacao)
+
+    def elites(self):
+        # Os 'elitismo' melhores indivíduos, por seleção parcial com heap
+        # (O(N log k) em vez de ordenar toda a população)
+        if self.elitismo <= 0:
+            return []
+        return heapq.nlargest(self.elitismo, self.populacao,
+                              key=lambda ind: ind.notaAvaliacao)
+
     def melhorIndividuo(self, individuo):
         # Atualiza o melhor indivíduo global se encontrar um superior
         if individuo.notaAvaliacao > self.melhorSolucao.notaAvaliacao:
@@ -97,7 +401,7 @@ class AlgoritmoGenetico:
 
     def selecionaPai(self, somaAvaliacao):
         # Seleção por roleta: sorteia um pai proporcional ao fitness
-        valorSorteado = random.random() * somaAvaliacao
+        valorSorteado = self.rng.random() * somaAvaliacao
         soma = 0.0
         for i, ind in enumerate(self.populacao):
             soma += ind.notaAvaliacao
@@ -105,9 +409,18 @@ class AlgoritmoGenetico:
                 return i
         return len(self.populacao) - 1  # Retorna último caso não encontre antes
 
-    def visualizaGeracao(self):
+    def selecionaPais(self, quantidade):
+        # Sorteia todos os pais de uma geração numa única chamada
+        notas = np.fromiter((ind.notaAvaliacao for ind in self.populacao),
+                            dtype=float, count=len(self.populacao))
+        return selecionaIndices(self.selecao, notas, quantidade, self.rng,
+                                self.tamanhoTorneio)
+
+    def visualizaGeracao(self, melhor=None):
         # Mostra informações do melhor indivíduo da geração atual
-        melhor = self.populacao[0]
+        # (sem 'melhor', assume a população ordenada)
+        if melhor is None:
+            melhor = self.populacao[0]
         print(f"G: {melhor.geracao} "
               f"Valor: {melhor.notaAvaliacao:.2f} "
               f"Espaco: {melhor.espacoUsado:.3f} "
@@ -118,42 +431,227 @@ class AlgoritmoGenetico:
         # Algoritmo principal (loop evolutivo)
         self.inicializaPopulacao(espacos, valores, limiteEspacos)
 
-        # Avalia e ordena população inicial
-        for ind in self.populacao:
-            ind.avaliacao()
-        self.ordenaPopulacao()
-        self.visualizaGeracao()
+        # Avalia população inicial e registra o melhor
+        self.avaliaLote(self.populacao)
+        melhor = self.melhorDaGeracao()
+        self.melhorSolucao = melhor
+        self.visualizaGeracao(melhor)
 
         # Loop das gerações
         for _ in range(numeroGeracoes):
-            somaAvaliacao = self.somaAvaliacoes()
-            novaPopulacao = []
+            # Elites passam intactas (já avaliadas) para a próxima geração
+            novaPopulacao = self.elites()
+            numeroFilhos = self.tamanhoPopulacao - len(novaPopulacao)
+            filhosGerados = []
 
-            # Gera nova população através de seleção, crossover e mutação
-            for _ in range(0, self.tamanhoPopulacao // 2):
-                pai1 = self.selecionaPai(somaAvaliacao)
-                pai2 = self.selecionaPai(somaAvaliacao)
+            # Completa a nova população através de seleção, crossover e mutação
+            pais = self.selecionaPais(2 * ((numeroFilhos + 1) // 2)).tolist()
+            for k in range(0, len(pais), 2):
+                pai1, pai2 = pais[k], pais[k + 1]
 
                 filhos = self.populacao[pai1].crossover(self.populacao[pai2])
-                novaPopulacao.append(filhos[0].mutacao(taxaMutacao))
-                novaPopulacao.append(filhos[1].mutacao(taxaMutacao))
+                for filho in filhos:
+                    filho.mutacao(taxaMutacao)
+                filhosGerados.extend(filhos)
+
+            # Só os filhos precisam ser avaliados (em geral já pontuados
+            # de forma incremental)
+            filhosGerados = filhosGerados[:numeroFilhos]
+            self.avaliaLote(filhosGerados)
 
             # Substitui população antiga pela nova
-            self.populacao = novaPopulacao
-            for ind in self.populacao:
-                ind.avaliacao()
-            self.ordenaPopulacao()
-            self.visualizaGeracao()
-            self.melhorIndividuo(self.populacao[0])
+            self.populacao = novaPopulacao + filhosGerados
+            melhor = self.melhorDaGeracao()
+            self.visualizaGeracao(melhor)
+            self.melhorIndividuo(melhor)
 
         # Exibe e retorna a melhor solução encontrada
         print(f"\nMelhor solução -> Geração {self.melhorSolucao.geracao} "
               f"Valor: {self.melhorSolucao.notaAvaliacao:.2f} "
               f"Espaço: {self.melhorSolucao.espacoUsado:.3f} "
               f"Cromossomo: {self.melhorSolucao.cromossomo}")
+        if self.cache is not None:
+            print(self.cache)
         return self.melhorSolucao.cromossomo
 
 
+# ---------------- Fitness para o Avaliador ----------------
+def somasMochila(cromossomo, dados):
+    # (valor total, espaço usado) de um cromossomo, com os arrays do
+    # problema em dados["valores"] e dados["espacos"] (ver Avaliador)
+    escolhidos = np.frombuffer("".join(cromossomo).encode(),
+                               dtype=np.uint8) == ord("1")
+    return (float(dados["valores"][escolhidos].sum()),
+            float(dados["espacos"][escolhidos].sum()))
+
+
+# ---------------- Leitura de itens de arquivo ----------------
+def carregaItens(caminho, campoEspaco="espaco", campoValor="valor"):
+    # Lê os itens de um CSV (com cabeçalho) ou JSONL (um objeto por linha)
+    # em fluxo, direto para arrays contíguos de float64, sem criar um
+    # Produto por linha. Retorna (espacos, valores) como arrays NumPy.
+    espacos = array("d")
+    valores = array("d")
+    with open(caminho, newline="", encoding="utf-8") as arq:
+        if caminho.endswith((".jsonl", ".ndjson")):
+            for linha in arq:
+                if linha.strip():
+                    item = json.loads(linha)
+                    espacos.append(float(item[campoEspaco]))
+                    valores.append(float(item[campoValor]))
+        else:
+            leitor = csv.reader(arq)
+            cabecalho = next(leitor)
+            iEspaco = cabecalho.index(campoEspaco)
+            iValor = cabecalho.index(campoValor)
+            for linha in leitor:
+                if linha:
+                    espacos.append(float(linha[iEspaco]))
+                    valores.append(float(linha[iValor]))
+    return np.frombuffer(espacos), np.frombuffer(valores)
+
+
+# ---------------- Produto matriz-vetor em blocos ----------------
+def produtoEmBlocos(matriz, vetor, elementosPorBloco=1 << 22):
+    # matriz (N, n) uint8 @ vetor (n,) float64, convertendo só um bloco de
+    # linhas por vez para float64 (evita uma cópia float64 da matriz inteira)
+    linhas = max(1, elementosPorBloco // max(1, matriz.shape[1]))
+    resultado = np.empty(matriz.shape[0])
+    for i in range(0, matriz.shape[0], linhas):
+        resultado[i:i + linhas] = matriz[i:i + linhas] @ vetor
+    return resultado
+
+
+# ---------------- Classe Algoritmo Genético Vetorizado ----------------
+class AlgoritmoGeneticoVetorizado:
+    # Mesmo AG da classe AlgoritmoGenetico (roleta, crossover de um ponto,
+    # mutação por gene, penalidade nota = 1.0 quando estoura o limite), mas
+    # com a população inteira numa matriz (N, itens) de uint8 0/1:
+    #  - avaliação: dois produtos matriz-vetor (valores e espaços)
+    #  - crossover e mutação: operações mascaradas sobre a matriz
+    #  - elitismo: as 'elitismo' melhores linhas (argpartition) passam intactas
+    # Indicado para mochilas com muitos itens e populações grandes.
+    def __init__(self, tamanhoPopulacao, semente=None, selecao=ROLETA,
+                 tamanhoTorneio=3, elitismo=0):
+        self.tamanhoPopulacao = tamanhoPopulacao # Número de indivíduos
+        self.rng = GeradorAleatorio(semente)     # Gerador aleatório da execução
+        self.selecao = selecao                   # ROLETA, SUS ou TORNEIO
+        self.tamanhoTorneio = tamanhoTorneio     # k do torneio
+        self.elitismo = elitismo                 # Melhores mantidos a cada geração
+        self.cromossomos = None                  # Matriz (N, itens) de genes 0/1
+        self.notas = None                        # Fitness de cada indivíduo
+        self.espacosUsados = None                # Espaço usado por cada indivíduo
+        self.geracao = 0                         # Geração atual
+        self.melhorCromossomo = None             # Melhor solução já encontrada
+        self.melhorNota = 0.0
+        self.melhorEspaco = 0.0
+        self.melhorGeracao = 0
+
+    def inicializaPopulacao(self, numeroItens):
+        # Cada gene tem 50% de chance de ser 1
+        self.cromossomos = self.rng.gerador.integers(
+            0, 2, size=(self.tamanhoPopulacao, numeroItens), dtype=np.uint8)
+        self.geracao = 0
+
+    @staticmethod
+    def avaliaMatriz(matriz, espacos, valores, limiteEspacos):
+        # Notas e espaços usados de cada linha com dois produtos matriz-vetor
+        espacosUsados = produtoEmBlocos(matriz, espacos)
+        notas = produtoEmBlocos(matriz, valores)
+        return np.where(espacosUsados > limiteEspacos, 1.0, notas), espacosUsados
+
+    def avaliacao(self, espacos, valores, limiteEspacos):
+        # Fitness de toda a população
+        self.notas, self.espacosUsados = self.avaliaMatriz(
+            self.cromossomos, espacos, valores, limiteEspacos)
+        return self.registraMelhor()
+
+    def registraMelhor(self):
+        # Atualiza o melhor indivíduo global; retorna o melhor da geração
+        i = int(np.argmax(self.notas))
+        if self.melhorCromossomo is None or self.notas[i] > self.melhorNota:
+            self.melhorCromossomo = self.cromossomos[i].copy()
+            self.melhorNota = float(self.notas[i])
+            self.melhorEspaco = float(self.espacosUsados[i])
+            self.melhorGeracao = self.geracao
+        return i
+
+    def selecionaPais(self, quantidade):
+        # Todos os pais da geração de uma vez (operador self.selecao)
+        return selecionaIndices(self.selecao, self.notas, quantidade, self.rng,
+                                self.tamanhoTorneio)
+
+    def crossover(self, pais1, pais2):
+        # Crossover de um ponto para todos os pares: os genes antes do corte
+        # vêm do outro pai (como em Individuo.crossover)
+        n = self.cromossomos.shape[1]
+        cortes = np.rint(self.rng.randoms(len(pais1)) * n).astype(np.int64)
+        antes = np.arange(n) < cortes[:, None]
+        c1, c2 = self.cromossomos[pais1], self.cromossomos[pais2]
+        filhos1 = np.where(antes, c2, c1)
+        filhos2 = np.where(antes, c1, c2)
+        return np.concatenate([filhos1, filhos2])
+
+    def mutacao(self, taxaMutacao, matriz=None):
+        # Sorteia diretamente as posições mutadas (em média N * itens * taxa)
+        # e inverte os genes, sem sortear um número por gene
+        if matriz is None:
+            matriz = self.cromossomos
+        total = matriz.size
+        quantidade = self.rng.gerador.binomial(total, taxaMutacao)
+        posicoes = np.unique(self.rng.gerador.integers(0, total, size=quantidade))
+        matriz.flat[posicoes] ^= 1
+
+    def indicesElites(self):
+        # Índices das 'elitismo' melhores linhas por seleção parcial
+        k = min(self.elitismo, self.tamanhoPopulacao)
+        if k <= 0:
+            return np.empty(0, dtype=np.int64)
+        return np.argpartition(-self.notas, k - 1)[:k]
+
+    def visualizaGeracao(self, i):
+        # Mostra informações do melhor indivíduo da geração atual
+        print(f"G: {self.geracao} "
+              f"Valor: {self.notas[i]:.2f} "
+              f"Espaco: {self.espacosUsados[i]:.3f}")
+
+    def resolver(self, taxaMutacao, numeroGeracoes, espacos, valores,
+                 limiteEspacos, mostrar=True):
+        espacos = np.asarray(espacos, dtype=float)
+        valores = np.asarray(valores, dtype=float)
+        self.inicializaPopulacao(len(espacos))
+        i = self.avaliacao(espacos, valores, limiteEspacos)
+        if mostrar:
+            self.visualizaGeracao(i)
+
+        # Loop das gerações
+        for _ in range(numeroGeracoes):
+            # Elites passam intactas (e já avaliadas); filhos completam a população
+            elites = self.indicesElites()
+            numeroFilhos = self.tamanhoPopulacao - len(elites)
+            pares = (numeroFilhos + 1) // 2
+            pais = self.selecionaPais(2 * pares)
+            filhos = self.crossover(pais[:pares], pais[pares:])[:numeroFilhos]
+            self.mutacao(taxaMutacao, filhos)
+            notas, espacosUsados = self.avaliaMatriz(filhos, espacos, valores,
+                                                     limiteEspacos)
+            self.cromossomos = np.concatenate([self.cromossomos[elites], filhos])
+            self.notas = np.concatenate([self.notas[elites], notas])
+            self.espacosUsados = np.concatenate([self.espacosUsados[elites],
+                                                 espacosUsados])
+            self.geracao += 1
+            i = self.registraMelhor()
+            if mostrar:
+                self.visualizaGeracao(i)
+
+        if mostrar:
+            print(f"\nMelhor solução -> Geração {self.melhorGeracao} "
+                  f"Valor: {self.melhorNota:.2f} "
+                  f"Espaço: {self.melhorEspaco:.3f}")
+        # Cromossomo no mesmo formato de AlgoritmoGenetico.resolver
+        return ["1" if g else "0" for g in self.melhorCromossomo]
+
+
 # ---------------- Execução principal ----------------
 if __name__ == "__main__":
     # Lista de produtos com nome, espaço ocupado e valor
@@ -195,3 +693,19 @@ if __name__ == "__main__":
     for i in range(len(listaProdutos)):
         if resultado[i] == "1":
             print("Nome:", listaProdutos[i].nome)
+
+    # Mesmo problema com a população em matriz (AG vetorizado)
+    agv = AlgoritmoGeneticoVetorizado(tamanhoPopulacao)
+    resultado = agv.resolver(taxaMutacao, numeroGeracoes, espacos, valores,
+                             limite, mostrar=False)
+    print(f"\nAG vetorizado -> Valor: {agv.melhorNota:.2f} "
+          f"Espaço: {agv.melhorEspaco:.3f}")
+
+    # Instância grande lida de arquivo (CSV ou JSONL com colunas espaco e
+    # valor): python AlgoritmoGenetico.py itens.csv capacidade
+    if len(sys.argv) > 2:
+        espacos, valores = carregaItens(sys.argv[1])
+        ag = AlgoritmoGenetico(tamanhoPopulacao, elitismo=2, fracaoGulosa=0.1,
+                               reparo=True)
+        resultado = ag.resolver(taxaMutacao, numeroGeracoes, espacos, valores,
+                                float(sys.argv[2]))
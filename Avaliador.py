@@ -0,0 +1,142 @@
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing import shared_memory
+import os
+import numpy as np
+
+# Backends de execução
+SERIAL = 'serial'        # no próprio processo, um candidato após o outro
+THREADS = 'threads'      # pool de threads (f que libera o GIL: NumPy, E/S...)
+PROCESSOS = 'processos'  # pool de processos (f em Python puro)
+
+# Estado de cada processo trabalhador (preenchido por inicializa_trabalhador)
+FUNCAO_TRABALHADOR = None
+DADOS_TRABALHADOR = None
+MEMORIAS_TRABALHADOR = []
+
+
+def avalia_bloco(f, bloco, dados, vetorizada):
+    # Avalia um bloco de candidatos: f(candidato[, dados]) para cada um, ou
+    # f(bloco[, dados]) de uma vez quando a função é vetorizada
+    if vetorizada:
+        resultado = f(bloco) if dados is None else f(bloco, dados)
+        return list(resultado)
+    if dados is None:
+        return [f(c) for c in bloco]
+    return [f(c, dados) for c in bloco]
+
+
+def inicializa_trabalhador(f, descritores, vetorizada):
+    # Roda uma vez em cada processo: guarda f e abre os dados do problema
+    # direto da memória compartilhada (sem cópia por tarefa)
+    global FUNCAO_TRABALHADOR, DADOS_TRABALHADOR
+    FUNCAO_TRABALHADOR = (f, vetorizada)
+    if descritores is None:
+        DADOS_TRABALHADOR = None
+        return
+    DADOS_TRABALHADOR = {}
+    for nome, (nome_memoria, forma, tipo) in descritores.items():
+        memoria = shared_memory.SharedMemory(name=nome_memoria)
+        MEMORIAS_TRABALHADOR.append(memoria)  # mantém o bloco aberto
+        DADOS_TRABALHADOR[nome] = np.ndarray(forma, dtype=tipo,
+                                             buffer=memoria.buf)
+
+
+def avalia_bloco_trabalhador(bloco):
+    f, vetorizada = FUNCAO_TRABALHADOR
+    return avalia_bloco(f, bloco, DADOS_TRABALHADOR, vetorizada)
+
+
+# ---------------- Avaliador de populações em lote ----------------
+class Avaliador:
+    # Avalia uma geração inteira de candidatos de uma vez, distribuindo-os
+    # em blocos para o backend escolhido (SERIAL, THREADS ou PROCESSOS).
+    #  - f(candidato) ou, com 'dados', f(candidato, dados); com
+    #    vetorizada=True, f recebe o bloco inteiro e retorna um resultado
+    #    por candidato
+    #  - dados: dicionário nome -> ndarray com os dados do problema. Em
+    #    PROCESSOS os arrays são copiados uma única vez para memória
+    #    compartilhada e abertos por cada trabalhador, em vez de serem
+    #    enviados junto com cada bloco
+    #  - tamanho_bloco: candidatos por tarefa (padrão: ~4 blocos por
+    #    trabalhador por chamada)
+    # Em PROCESSOS, f precisa ser uma função de módulo (serializável) e o
+    # script deve proteger a execução com if __name__ == "__main__".
+    # Use com 'with' (ou chame fechar()) para liberar o pool e a memória.
+
+    def __init__(self, f, backend=SERIAL, trabalhadores=None, tamanho_bloco=None,
+                 dados=None, vetorizada=False):
+        self.f = f
+        self.backend = backend
+        self.trabalhadores = trabalhadores or os.cpu_count() or 1
+        self.tamanho_bloco = tamanho_bloco
+        self.dados = dados
+        self.vetorizada = vetorizada
+        self.avaliacoes = 0      # candidatos avaliados até agora
+        self.memorias = []       # blocos de memória compartilhada criados
+        self.pool = None
+        if backend == THREADS:
+            self.pool = ThreadPoolExecutor(self.trabalhadores)
+        elif backend == PROCESSOS:
+            descritores = None
+            if dados is not None:
+                descritores = {}
+                for nome, array in dados.items():
+                    array = np.ascontiguousarray(array)
+                    memoria = shared_memory.SharedMemory(create=True,
+                                                         size=max(1, array.nbytes))
+                    np.ndarray(array.shape, dtype=array.dtype,
+                               buffer=memoria.buf)[...] = array
+                    self.memorias.append(memoria)
+                    descritores[nome] = (memoria.name, array.shape,
+                                         array.dtype.str)
+            self.pool = ProcessPoolExecutor(
+                self.trabalhadores, initializer=inicializa_trabalhador,
+                initargs=(f, descritores, vetorizada))
+        elif backend != SERIAL:
+            raise ValueError(f"backend desconhecido: {backend}")
+
+    def blocos(self, candidatos):
+        # Fatia os candidatos (lista ou array) em blocos consecutivos
+        n = len(candidatos)
+        tamanho = self.tamanho_bloco or max(1, -(-n // (4 * self.trabalhadores)))
+        return [candidatos[i:i + tamanho] for i in range(0, n, tamanho)]
+
+    def avalia(self, candidatos):
+        # Resultados de f para todos os candidatos, na mesma ordem
+        self.avaliacoes += len(candidatos)
+        if len(candidatos) == 0:
+            return []
+        if self.pool is None:
+            return avalia_bloco(self.f, candidatos, self.dados, self.vetorizada)
+        if self.backend == PROCESSOS:
+            partes = self.pool.map(avalia_bloco_trabalhador,
+                                   self.blocos(candidatos))
+        else:
+            partes = self.pool.map(
+                lambda bloco: avalia_bloco(self.f, bloco, self.dados,
+                                           self.vetorizada),
+                self.blocos(candidatos))
+        resultado = []
+        for parte in partes:
+            resultado.extend(parte)
+        return resultado
+
+    def fechar(self):
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+        for memoria in self.memorias:
+            memoria.close()
+            memoria.unlink()
+        self.memorias = []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *excecao):
+        self.fechar()
+
+    def __repr__(self):
+        return (f"Avaliador(backend={self.backend}, "
+                f"trabalhadores={self.trabalhadores}, "
+                f"avaliacoes={self.avaliacoes})")
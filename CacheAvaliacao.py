@@ -0,0 +1,82 @@
+from collections import OrderedDict
+import numpy as np
+
+# ---------------- Cache de avaliações da função objetivo ----------------
+class CacheAvaliacao:
+    # Envolve uma função objetivo f e memoriza seus valores.
+    # A chave é a entrada quantizada (round(x / resolucao)), de modo que
+    # pontos que diferem apenas por erro de ponto flutuante (ex.: x + passo
+    # - passo) compartilham a mesma entrada. O tamanho é limitado e a
+    # entrada usada há mais tempo é descartada (LRU).
+    # A mesma instância pode ser passada como f para várias execuções e
+    # reinícios, acumulando acertos entre elas.
+
+    def __init__(self, f, resolucao=1e-9, tamanho_max=100000):
+        self.f = f
+        self.resolucao = resolucao
+        self.tamanho_max = tamanho_max
+        self.valores = OrderedDict()   # chave quantizada -> f(x)
+        self.acertos = 0               # avaliações economizadas
+        self.falhas = 0                # avaliações realmente feitas
+
+    def chave(self, x):
+        # Quantiza x (escalar ou vetor) na grade de 'resolucao'
+        q = np.rint(np.asarray(x, dtype=float) / self.resolucao).astype(np.int64)
+        return q.item() if q.ndim == 0 else q.tobytes()
+
+    def busca(self, chave):
+        # Retorna o valor memorizado (ou None) e marca como usado recentemente
+        valor = self.valores.get(chave)
+        if valor is not None:
+            self.valores.move_to_end(chave)
+        return valor
+
+    def guarda(self, chave, valor):
+        self.valores[chave] = valor
+        self.valores.move_to_end(chave)
+        if len(self.valores) > self.tamanho_max:
+            self.valores.popitem(last=False)  # descarta o menos usado
+
+    def __call__(self, x):
+        xs = np.asarray(x, dtype=float)
+        if xs.ndim == 0:
+            # Chamada escalar (hillClimbing)
+            chave = self.chave(xs)
+            valor = self.busca(chave)
+            if valor is not None:
+                self.acertos += 1
+                return valor
+            self.falhas += 1
+            valor = self.f(x)
+            self.guarda(chave, valor)
+            return valor
+
+        # Chamada em lote: vetor de escalares (ndim 1) ou matriz de pontos
+        # (ndim 2, uma linha por ponto). Só as entradas ausentes são
+        # avaliadas, numa única chamada de f.
+        chaves = [self.chave(p) for p in xs]
+        resultado = np.empty(len(chaves))
+        faltando = []
+        for i, chave in enumerate(chaves):
+            valor = self.busca(chave)
+            if valor is None:
+                faltando.append(i)
+            else:
+                resultado[i] = valor
+        self.acertos += len(chaves) - len(faltando)
+        self.falhas += len(faltando)
+        if faltando:
+            novos = np.asarray(self.f(xs[faltando]), dtype=float)
+            for i, valor in zip(faltando, novos):
+                resultado[i] = valor
+                self.guarda(chaves[i], float(valor))
+        return resultado
+
+    def taxa_acerto(self):
+        total = self.acertos + self.falhas
+        return self.acertos / total if total else 0.0
+
+    def __repr__(self):
+        return (f"CacheAvaliacao(entradas={len(self.valores)}, "
+                f"acertos={self.acertos}, falhas={self.falhas}, "
+                f"taxa={self.taxa_acerto():.1%})")
@@ -1,4 +1,4 @@
-import random
+from GeradorAleatorio import GeradorAleatorio
 
 class Aresta:
     def __init__(self, o: str, d: str):
@@ -63,10 +63,11 @@ class Caminho:
         self.feromonio = feromonio
 
 class ColoniaFormigas:
-    def __init__(self, inicio: str, fim: str):
+    def __init__(self, inicio: str, fim: str, semente: int | None = None):
         self.caminhos = []
         self.inicio = inicio
         self.fim = fim
+        self.rng = GeradorAleatorio(semente)
 
     def addCaminho(self, umCaminho: Caminho) -> None:
         self.getCaminhos().append(umCaminho)
@@ -125,7 +126,7 @@ class ColoniaFormigas:
         escolha = None
         cont = 0
         soma = 0.0
-        sorteio = random.random()
+        sorteio = self.rng.random()
 
         adjs = umCaminho.getAdjacentes()
         if adjs:
@@ -150,7 +151,7 @@ class ColoniaFormigas:
         escolha = None
         cont = 0
         soma = 0.0
-        sorteio = random.random()
+        sorteio = self.rng.random()
 
         for p in probabilidades:
             soma += p
@@ -1,15 +1,38 @@
-import random
-from typing import List, Tuple
+from concurrent.futures import ProcessPoolExecutor
+from typing import List, Optional, Tuple
+import numpy as np
+from Avaliador import Avaliador
+from GeradorAleatorio import GeradorAleatorio, GERADOR_PADRAO
+from ProblemaDieta import ProblemaDieta
+
+# Estratégias de mutação
+RAND1 = 'rand/1'                  # V = A + F * (B - C)
+BEST1 = 'best/1'                  # V = melhor + F * (B - C)
+PBEST1 = 'current-to-pbest/1'     # V = X + F * (pmelhor - X) + F * (B - C~),
+                                  #     com C~ da população ou do arquivo externo
+
+# Topologias de migração do modelo de ilhas
+ANEL = 'anel'            # ilha i envia para a ilha i + 1
+ALEATORIA = 'aleatoria'  # cada ilha envia para outra ilha sorteada
+# Políticas de substituição dos migrantes na ilha de destino
+PIORES = 'piores'        # migrantes substituem os piores indivíduos
+ALEATORIOS = 'aleatorios'  # migrantes substituem indivíduos sorteados (exceto o melhor)
 
 # ------------------------------ Classe Prato ------------------------------
 class Prato:
-    def __init__(self, tamanho: int = 5, inicializar: bool = True):
+    def __init__(self, tamanho: int = 5, inicializar: bool = True,
+                 rng: Optional[GeradorAleatorio] = None,
+                 vetor: Optional[np.ndarray] = None):
         # Lista de valores (genes). Cada gene ~ quantidade/peso de um alimento.
+        # Com 'vetor', o prato é uma visão de uma linha da matriz da população
+        # (alterações na matriz aparecem no prato e vice-versa).
         self.alimentos: List[float] = []
-        if inicializar:
+        if vetor is not None:
+            self.alimentos = vetor
+        elif inicializar:
             # Inicializa com valores aleatórios uniformes em [0, 200)
-            for _ in range(tamanho):
-                self.alimentos.append(random.random() * 200.0)
+            rng = rng if rng is not None else GERADOR_PADRAO
+            self.alimentos = (rng.randoms(tamanho) * 200.0).tolist()
         else:
             # Constrói o vetor vazio (será preenchido depois)
             self.alimentos = []
@@ -30,68 +53,155 @@ class EvolucaoDiferencial:
     #  - tamanho: tamanho da população (número de pratos/candidatos)
     #  - F: fator diferencial (peso do termo (B - C)), tipicamente em [0, 2]
     #  - CR: taxa de cruzamento (crossover binomial), tipicamente em [0, 1]
+    #  - problema: ProblemaDieta com a tabela de alimentos, os alvos e os
+    #    limites de cada alimento (padrão: os 5 alimentos originais)
+    #  - estrategia: RAND1 (original), BEST1 ou PBEST1
+    #  - p: fração dos melhores de onde sai o 'pmelhor' de PBEST1
+    #  - adaptativo: se True, F e CR de cada indivíduo são sorteados a partir
+    #    de uma memória de sucessos com 'memoria' posições (estilo SHADE) e
+    #    F/CR passam a ser só os valores iniciais dessa memória
+    #  - avaliador: Avaliador opcional que recebe a matriz de cada geração
+    #    (uma linha por prato) e retorna um fitness por linha; sem ele, o
+    #    fitness é o do problema (ex.: Avaliador(fitness_pratos,
+    #    dados=problema.dados(), vetorizada=True, backend=PROCESSOS))
     # O objetivo é MINIMIZAR a função de fitness (quanto menor, melhor).
 
-    def __init__(self, tamanho: int, F: float = 0.8, CR: float = 0.3):
+    def __init__(self, tamanho: int, F: float = 0.8, CR: float = 0.3,
+                 semente: Optional[int] = None,
+                 problema: Optional[ProblemaDieta] = None,
+                 estrategia: str = RAND1, p: float = 0.1,
+                 adaptativo: bool = False, memoria: int = 5,
+                 avaliador: Optional[Avaliador] = None):
+        if tamanho < 4:
+            # cada parental precisa de 3 doadores distintos dele e entre si
+            raise ValueError(f"a população precisa de pelo menos 4 pratos "
+                             f"(tamanho={tamanho})")
         self.tamanho = tamanho
         self.F = F
         self.CR = CR
-        # População de pratos (candidatos)
+        self.estrategia = estrategia
+        self.p = p
+        self.adaptativo = adaptativo
+        self.avaliador = avaliador
+        # Memória de sucessos (SHADE): médias de F e CR que deram certo
+        self.memoria_F = np.full(memoria, F)
+        self.memoria_CR = np.full(memoria, CR)
+        self.posicao_memoria = 0
+        # Arquivo externo de parentais substituídos (usado por PBEST1)
+        self.arquivo: np.ndarray = np.empty((0, 0))
+        # Melhor fitness ao fim de cada geração
+        self.historico: List[float] = []
+        self.problema = problema if problema is not None else ProblemaDieta.padrao()
+        # Gerador aleatório da execução (reprodutível com 'semente')
+        self.rng = GeradorAleatorio(semente)
+        # População como matriz (tamanho, alimentos): uma linha por prato
+        self.matriz: np.ndarray = np.empty((0, self.problema.dimensao))
+        # Pratos (candidatos): visões das linhas de self.matriz
         self.pratos: List[Prato] = []
+        # Fitness de cada linha de self.matriz, mantido junto com a população
+        # (só muda quando um indivíduo é substituído)
+        self.aptidoes: np.ndarray = np.empty(0)
+        self.melhor_idx = 0
+        # Total de avaliações de fitness feitas (para orçamentos)
+        self.avaliacoes = 0
+
+    # Serialização: um único caminho, estado() / restaura()
+    # estado(): só o estado da população (matriz, fitness, memória, arquivo,
+    # gerador e parâmetros), sem o problema, o avaliador e os pratos (visões
+    # da matriz, recriados por restaura). É o que o modelo de ilhas troca
+    # com os processos, que já têm o problema.
+    def estado(self) -> dict:
+        return {chave: valor for chave, valor in self.__dict__.items()
+                if chave not in ('problema', 'avaliador', 'pratos')}
+
+    def restaura(self, estado: dict) -> None:
+        self.__dict__.update(estado)
+        self.pratos = [Prato(vetor=linha) for linha in self.matriz]
+
+    @classmethod
+    def de_estado(cls, estado: dict, problema: ProblemaDieta) -> "EvolucaoDiferencial":
+        ed = cls.__new__(cls)
+        ed.__setstate__({'estado': estado, 'problema': problema})
+        return ed
+
+    # pickle direto: estado() mais o problema; o avaliador (pools e memória
+    # compartilhada) não pode ser serializado
+    def __getstate__(self):
+        if self.avaliador is not None:
+            raise TypeError("EvolucaoDiferencial com avaliador não pode ser "
+                            "serializado")
+        return {'estado': self.estado(), 'problema': self.problema}
+
+    def __setstate__(self, dados):
+        self.problema = dados['problema']
+        self.avaliador = None
+        self.restaura(dados['estado'])
 
     # ---------- Inicialização ----------
     def populacao(self) -> List[Prato]:
-        # Cria a população inicial com 'tamanho' pratos aleatórios.
-        self.pratos = [Prato(tamanho=5, inicializar=True)
-        for _ in range(self.tamanho)]
+        # Cria a população inicial com 'tamanho' pratos aleatórios dentro
+        # dos limites de cada alimento ([0, 200) no problema original).
+        self.matriz = self.problema.aleatorios(self.tamanho, self.rng)
+        self.pratos = [Prato(vetor=linha) for linha in self.matriz]
+        self.aptidoes = self.avaliar(self.matriz)
+        self.melhor_idx = int(np.argmin(self.aptidoes))
+        self.arquivo = np.empty((0, self.problema.dimensao))
         return self.pratos
 
     # ---------- Função de avaliação (fitness) ----------
-    @staticmethod
-    def fitness(um_prato: Prato) -> float:
-        # Calcula o 'erro' em relação às proporções ideais da refeição:
-        #  - 55% carboidratos, 30% proteínas, 15% gorduras.
-        # A função soma as diferenças absolutas entre as porcentagens obtidas e as ideais.
-        # Quanto MENOR o retorno, MELHOR o prato (minimização).
-
-        a = um_prato.alimentos
-
-        carboidratos = a[0] * 0.05 + a[1] * 0.24 + a[2] * 0.26 + \
-                       a[3] * 0.15 + a[4] * 0.29
-        proteinas    = a[0] * 0.23 + a[1] * 0.02 + a[2] * 0.026 + \
-                       a[3] * 0.13 + a[4] * 0.095
-        gorduras     = a[0] * 0.05 + a[1] * 0.00 + a[2] * 0.01 + \
-                       a[3] * 0.089 + a[4] * 0.014
-
-        total = carboidratos + proteinas + gorduras
-
-        # Evita divisão por zero (se tudo zerado). Penaliza fortemente esse caso.
-        if total <= 1e-12:
-            return 1e9
-
-        # Converte para porcentagens
-        porcao_carbo = (carboidratos / total) * 100.0
-        porcao_prot  = (proteinas / total) * 100.0
-        porcao_gord  = (gorduras / total) * 100.0
-
-        # Diferenças absolutas para os alvos (55/30/15)
-        diff_carbo = abs(porcao_carbo - 55.0)
-        diff_prot  = abs(porcao_prot - 30.0)
-        diff_gord  = abs(porcao_gord - 15.0)
-
-        # Soma das diferenças: objetivo é minimizar
-        diff_total = diff_carbo + diff_prot + diff_gord
-        return diff_total
+    def fitness_lote(self, matriz: np.ndarray) -> np.ndarray:
+        # Fitness de vários pratos de uma vez (uma linha por prato), definido
+        # pelo problema: erro das proporções de nutrientes em relação aos
+        # alvos. Quanto MENOR o retorno, MELHOR o prato (minimização).
+        return self.problema.fitness_lote(matriz)
+
+    def avaliar(self, matriz: np.ndarray) -> np.ndarray:
+        # fitness_lote (ou o avaliador, se houver) contabilizando as
+        # avaliações em self.avaliacoes
+        self.avaliacoes += matriz.shape[0]
+        if self.avaliador is not None:
+            return np.asarray(self.avaliador.avalia(matriz), dtype=float)
+        return self.fitness_lote(matriz)
+
+    def fitness(self, um_prato: Prato) -> float:
+        # Fitness de um único prato (ver fitness_lote).
+        a = np.asarray(um_prato.alimentos, dtype=float)
+        return float(self.fitness_lote(a[None, :])[0])
 
     # ---------- Seleção de 3 vetores (A, B, C) diferentes do parental ----------
-    def seleciona3(self, parental: int) -> Tuple[Prato, Prato, Prato]:
-        # Seleciona aleatoriamente 3 indivíduos distintos do 'parental'.
+    def seleciona3_indices(self, parental: int) -> Tuple[int, int, int]:
+        # Sorteia os índices de 3 indivíduos distintos do 'parental' em O(1):
+        # sorteia em [0, tamanho - 1) e pula o parental; repete só em caso de
+        # colisão entre os doadores (raro para populações grandes).
+        n = self.tamanho - 1
+        escolhidos: List[int] = []
+        while len(escolhidos) < 3:
+            i = int(self.rng.random() * n)
+            if i >= parental:
+                i += 1
+            if i not in escolhidos:
+                escolhidos.append(i)
+        iA, iB, iC = escolhidos
+        return iA, iB, iC
 
-        indices = [i for i in range(self.tamanho) if i != parental]
+    def indices_doadores(self) -> np.ndarray:
+        # Matriz (tamanho, 3) com os doadores (A, B, C) de todos os parentais
+        # de uma geração, distintos entre si e do parental da linha.
+        # Cada coluna é sorteada em [0, tamanho - k) e "pula" os k índices já
+        # usados na linha (em ordem crescente), o que dá um sorteio uniforme
+        # sem repetição, sem laços em Python.
+        n = self.tamanho
+        usados = np.arange(n)[:, None]     # começa só com o parental
+        for k in range(1, 4):
+            novo = self.rng.gerador.integers(0, n - k, size=n)
+            for coluna in np.sort(usados, axis=1).T:
+                novo += novo >= coluna
+            usados = np.column_stack([usados, novo])
+        return usados[:, 1:]
 
-        # Embaralha e pega 3 primeiros
-        random.shuffle(indices)
-        iA, iB, iC = indices[:3]
+    def seleciona3(self, parental: int) -> Tuple[Prato, Prato, Prato]:
+        # Seleciona aleatoriamente 3 indivíduos distintos do 'parental'.
+        iA, iB, iC = self.seleciona3_indices(parental)
         return self.pratos[iA], self.pratos[iB], self.pratos[iC]
 
     # ---------- Mutação + crossover binomial (gera 'tentativa') ----------
@@ -100,14 +210,16 @@ class EvolucaoDiferencial:
         # Para cada gene:
         #  - Com prob. CR, usa: X = A + F * (B - C)
         #  - Caso contrário, copia o gene do parental
-        # Genes negativos são truncados para 0 (como no Java).
+        # Genes são truncados nos limites do alimento (>= 0 como no Java).
         A, B, C = trio
         prato_parental = self.pratos[parental]
 
-        tentativa = Prato(tamanho=5, inicializar=False)  # vazio; iremos preencher
+        tentativa = Prato(inicializar=False)  # vazio; iremos preencher
 
+        # Sorteios do crossover de todos os genes de uma vez
+        sorteios = self.rng.randoms(len(prato_parental.alimentos))
         for i in range(len(prato_parental.alimentos)):
-            R = random.random()
+            R = sorteios[i]
             if R < self.CR:
                 # DE/rand/1: componente mutante
                 X = A.alimentos[i] + self.F * (B.alimentos[i] - C.alimentos[i])
@@ -115,31 +227,258 @@ class EvolucaoDiferencial:
                 # Copia componente do parental (crossover binomial)
                 X = prato_parental.alimentos[i]
 
-            # Restrição: não permitir valores negativos
-            if X < 0.0:
-                X = 0.0
+            # Restrição: manter a quantidade nos limites do alimento
+            X = min(max(X, self.problema.minimos[i]), self.problema.maximos[i])
 
             tentativa.add(X)
 
         return tentativa
 
+    # ---------- Parâmetros F e CR de cada indivíduo ----------
+    def sorteia_parametros(self):
+        # Sem adaptação: F e CR fixos para todos. Com adaptação (SHADE):
+        # cada indivíduo sorteia uma posição da memória, CR ~ Normal(M_CR, 0.1)
+        # em [0, 1] e F ~ Cauchy(M_F, 0.1) em (0, 1] (re-sorteado se <= 0).
+        n = self.tamanho
+        if not self.adaptativo:
+            return np.full(n, self.F), np.full(n, self.CR)
+        gerador = self.rng.gerador
+        k = gerador.integers(0, len(self.memoria_F), size=n)
+        CR = np.clip(gerador.normal(self.memoria_CR[k], 0.1), 0.0, 1.0)
+        F = self.memoria_F[k] + 0.1 * gerador.standard_cauchy(n)
+        invalidos = F <= 0
+        while invalidos.any():
+            F[invalidos] = (self.memoria_F[k[invalidos]] +
+                            0.1 * gerador.standard_cauchy(invalidos.sum()))
+            invalidos = F <= 0
+        return np.minimum(F, 1.0), CR
+
+    def atualiza_memoria(self, F, CR, ganhos) -> None:
+        # Média de Lehmer (F) e média ponderada (CR) dos parâmetros que
+        # geraram tentativas vencedoras, com peso proporcional ao ganho
+        if ganhos.size == 0 or ganhos.sum() <= 0:
+            return
+        pesos = ganhos / ganhos.sum()
+        k = self.posicao_memoria
+        self.memoria_F[k] = (pesos * F ** 2).sum() / (pesos * F).sum()
+        self.memoria_CR[k] = (pesos * CR).sum()
+        self.posicao_memoria = (k + 1) % len(self.memoria_F)
+
+    # ---------- Geração inteira vetorizada ----------
+    def geracao(self) -> None:
+        # Executa uma geração completa como operações de matriz:
+        # doadores de todos os parentais, mutação (self.estrategia),
+        # crossover binomial, truncamento nos limites, fitness dos vetores tentativa
+        # e substituição dos parentais piores. Todos os tentativas são gerados
+        # a partir da população do início da geração.
+        X = self.matriz
+        n = self.tamanho
+        gerador = self.rng.gerador
+        doadores = self.indices_doadores()
+        A, B, C = X[doadores[:, 0]], X[doadores[:, 1]], X[doadores[:, 2]]
+        F, CR = self.sorteia_parametros()
+        Fc = F[:, None]
+
+        if self.estrategia == BEST1:
+            mutantes = X[self.melhor_idx] + Fc * (B - C)
+        elif self.estrategia == PBEST1:
+            # pmelhor: um dos ceil(p * n) melhores, sorteado por indivíduo
+            q = max(1, int(np.ceil(self.p * n)))
+            top = np.argpartition(self.aptidoes, q - 1)[:q]
+            pmelhor = X[top[gerador.integers(0, q, size=n)]]
+            # C~ vem da união população + arquivo
+            r = gerador.integers(0, n + len(self.arquivo), size=n)
+            do_arquivo = r >= n
+            C[do_arquivo] = self.arquivo[r[do_arquivo] - n]
+            mutantes = X + Fc * (pmelhor - X) + Fc * (B - C)
+        else:
+            mutantes = A + Fc * (B - C)
+
+        # Com prob. CR usa o gene mutante, senão copia o do parental
+        cruza = self.rng.randoms(X.shape) < CR[:, None]
+        if self.adaptativo:
+            # Garante ao menos um gene mutante por tentativa (j_rand)
+            cruza[np.arange(n), gerador.integers(0, X.shape[1], size=n)] = True
+        tentativas = np.where(cruza, mutantes, X)
+        # Restrição: manter as quantidades nos limites de cada alimento
+        self.problema.limita(tentativas)
+
+        # Substitui (na própria matriz) os parentais que perderam; só os
+        # tentativas são avaliados, o fitness dos parentais já é conhecido
+        aptidoes_t = self.avaliar(tentativas)
+        melhores = aptidoes_t < self.aptidoes
+        if self.estrategia == PBEST1:
+            # Parentais substituídos vão para o arquivo (limitado a n)
+            self.arquivo = np.concatenate([self.arquivo, X[melhores]])
+            if len(self.arquivo) > n:
+                manter = gerador.choice(len(self.arquivo), n, replace=False)
+                self.arquivo = self.arquivo[manter]
+        if self.adaptativo:
+            self.atualiza_memoria(F[melhores], CR[melhores],
+                                  self.aptidoes[melhores] - aptidoes_t[melhores])
+        X[melhores] = tentativas[melhores]
+        self.aptidoes[melhores] = aptidoes_t[melhores]
+        self.melhor_idx = int(np.argmin(self.aptidoes))
+        self.historico.append(float(self.aptidoes[self.melhor_idx]))
+
+    # ---------- Loop com critérios de parada ----------
+    def resolver(self, geracoes: int = 1000, avaliacoes_max: Optional[int] = None,
+                 alvo: Optional[float] = None, paciencia: Optional[int] = None,
+                 tolerancia: float = 1e-8,
+                 diversidade_min: Optional[float] = None) -> Prato:
+        # Executa gerações até atingir uma das condições de parada:
+        #  - 'geracoes' gerações ou 'avaliacoes_max' avaliações
+        #  - melhor fitness <= alvo
+        #  - estagnação: melhora do melhor fitness menor que 'tolerancia'
+        #    nas últimas 'paciencia' gerações
+        #  - diversidade (desvio padrão médio dos genes) < diversidade_min
+        # Retorna o melhor prato. Cria a população se ainda não existir.
+        if not self.pratos:
+            self.populacao()
+        for _ in range(geracoes):
+            if avaliacoes_max is not None and \
+                    self.avaliacoes + self.tamanho > avaliacoes_max:
+                break
+            self.geracao()
+            melhor = self.historico[-1]
+            if alvo is not None and melhor <= alvo:
+                break
+            if paciencia is not None and len(self.historico) > paciencia and \
+                    self.historico[-paciencia - 1] - melhor < tolerancia:
+                break
+            if diversidade_min is not None and \
+                    self.matriz.std(axis=0).mean() < diversidade_min:
+                break
+        return self.pratos[self.melhor_idx]
+
     # ---------- Índice do melhor vetor (menor fitness) ----------
     def melhor_vetor(self) -> int:
-        # Retorna o índice do indivíduo com MENOR fitness na população.
-        melhor_idx = 0
-        melhor_fit = self.fitness(self.pratos[0])
-        for i in range(1, self.tamanho):
-            f = self.fitness(self.pratos[i])
-            if f < melhor_fit:
-                melhor_idx = i
-                melhor_fit = f
-        return melhor_idx
+        # Retorna o índice do indivíduo com MENOR fitness na população
+        # (mantido a cada substituição, sem reavaliar ninguém).
+        return self.melhor_idx
 
     # ---------- Operações utilitárias (substituição) ----------
     def substituir_se_melhor(self, j: int, candidato: Prato) -> None:
         # Substitui o indivíduo j pelo candidato se o fitness do candidato for melhor (menor).
-        if self.fitness(candidato) < self.fitness(self.pratos[j]):
-            self.pratos[j] = candidato
+        # O fitness do incumbente vem de self.aptidoes; só o candidato é avaliado.
+        vetor = np.asarray(candidato.alimentos, dtype=float)
+        aptidao = float(self.avaliar(vetor[None, :])[0])
+        if aptidao < self.aptidoes[j]:
+            # Copia para a linha j da matriz; self.pratos[j] continua sendo a visão dela
+            self.matriz[j] = vetor
+            self.aptidoes[j] = aptidao
+            if aptidao < self.aptidoes[self.melhor_idx]:
+                self.melhor_idx = j
+
+    # ---------- Migração (modelo de ilhas) ----------
+    def emigrantes(self, quantidade: int) -> Tuple[np.ndarray, np.ndarray]:
+        # Cópias dos 'quantidade' melhores vetores e seus fitness
+        q = min(quantidade, self.tamanho)
+        idx = np.argpartition(self.aptidoes, q - 1)[:q]
+        return self.matriz[idx].copy(), self.aptidoes[idx].copy()
+
+    def recebe_imigrantes(self, vetores: np.ndarray, aptidoes: np.ndarray,
+                          substituicao: str = PIORES) -> None:
+        # Coloca os imigrantes (já avaliados) no lugar dos piores indivíduos
+        # ou de indivíduos sorteados, preservando o melhor da ilha
+        q = min(len(vetores), self.tamanho - 1)
+        if q <= 0:
+            return
+        if substituicao == ALEATORIOS:
+            candidatos = np.delete(np.arange(self.tamanho), self.melhor_idx)
+            idx = self.rng.gerador.choice(candidatos, q, replace=False)
+        else:
+            idx = np.argpartition(-self.aptidoes, q - 1)[:q]
+        self.matriz[idx] = vetores[:q]
+        self.aptidoes[idx] = aptidoes[:q]
+        self.melhor_idx = int(np.argmin(self.aptidoes))
+
+
+# Problema das ilhas em cada processo do pool (enviado uma vez, pelo
+# inicializador, e não a cada época)
+PROBLEMA_ILHA: Optional[ProblemaDieta] = None
+
+def inicializa_ilha(problema: ProblemaDieta) -> None:
+    global PROBLEMA_ILHA
+    PROBLEMA_ILHA = problema
+
+# Executa 'geracoes' gerações de uma ilha (roda num processo do pool):
+# recebe e devolve só o estado da população (ver EvolucaoDiferencial.estado)
+def executa_ilha(estado: dict, geracoes: int) -> dict:
+    ed = EvolucaoDiferencial.de_estado(estado, PROBLEMA_ILHA)
+    for _ in range(geracoes):
+        ed.geracao()
+    return ed.estado()
+
+# ---------------------------- Modelo de ilhas ----------------------------
+def evolucao_ilhas(ilhas: int = 4, tamanho: int = 50, geracoes: int = 1000,
+                   intervalo: int = 20, migrantes: int = 2,
+                   topologia: str = ANEL, substituicao: str = PIORES,
+                   processos: Optional[int] = None,
+                   semente: Optional[int] = None, **parametros):
+    # Executa 'ilhas' populações independentes de DE em processos separados.
+    # A cada 'intervalo' gerações, cada ilha envia cópias dos seus
+    # 'migrantes' melhores vetores para outra ilha (topologia ANEL ou
+    # ALEATORIA), onde substituem os PIORES ou indivíduos ALEATORIOS.
+    # Demais parâmetros (F, CR, problema, estrategia, ...) vão para cada
+    # EvolucaoDiferencial. Cada ilha tem sua própria semente derivada de
+    # 'semente'; o resultado não depende de 'processos'.
+    # Retorna o melhor prato global, seu fitness e o histórico (melhor
+    # fitness por geração) de cada ilha.
+    # O problema vai uma única vez para cada processo (tabelas mapeadas em
+    # memória continuam mapeadas); a cada época só o estado das populações
+    # é trocado. Um 'avaliador' só pode ser usado com processos=1.
+    if parametros.get('avaliador') is not None and processos != 1:
+        raise ValueError("avaliador não pode ser enviado para os processos "
+                         "das ilhas; use processos=1")
+    rng = GeradorAleatorio(semente)
+    populacoes = []
+    for gerador in rng.spawn(ilhas):
+        ed = EvolucaoDiferencial(tamanho, semente=gerador.sequencia, **parametros)
+        ed.populacao()
+        populacoes.append(ed)
+
+    pool = None
+    if processos != 1:
+        pool = ProcessPoolExecutor(max_workers=processos,
+                                   initializer=inicializa_ilha,
+                                   initargs=(populacoes[0].problema,))
+    try:
+        feitas = 0
+        while feitas < geracoes:
+            epoca = min(intervalo, geracoes - feitas)
+            if pool is not None:
+                estados = pool.map(executa_ilha,
+                                   [ed.estado() for ed in populacoes],
+                                   [epoca] * ilhas)
+                for ed, estado in zip(populacoes, estados):
+                    ed.restaura(estado)
+            else:
+                for ed in populacoes:
+                    for _ in range(epoca):
+                        ed.geracao()
+            feitas += epoca
+            if feitas >= geracoes or ilhas < 2:
+                break
+
+            # Migração: todos emigram antes de qualquer um receber
+            saidas = [ed.emigrantes(migrantes) for ed in populacoes]
+            for i, (vetores, aptidoes) in enumerate(saidas):
+                if topologia == ALEATORIA:
+                    destino = int(rng.random() * (ilhas - 1))
+                    destino += destino >= i
+                else:
+                    destino = (i + 1) % ilhas
+                populacoes[destino].recebe_imigrantes(vetores, aptidoes,
+                                                      substituicao)
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    melhor_ilha = min(populacoes, key=lambda ed: ed.aptidoes[ed.melhor_idx])
+    melhor = Prato(vetor=melhor_ilha.matriz[melhor_ilha.melhor_idx])
+    historicos = [ed.historico for ed in populacoes]
+    return melhor, float(melhor_ilha.aptidoes[melhor_ilha.melhor_idx]), historicos
 
 # ------------------------------- Execução --------------------------------
 if __name__ == "__main__":
@@ -155,18 +494,32 @@ if __name__ == "__main__":
     ed = EvolucaoDiferencial(tamanho=tamanho_pop, F=F, CR=CR)
     ed.populacao()
 
-    # Loop principal (duas camadas: externa = gerações, interna = indivíduos)
+    # Loop principal: cada geração (seleção dos doadores, mutação, crossover
+    # e substituição de todos os indivíduos) é feita de uma vez sobre a matriz
     for _ in range(iteracoes):
-        for j in range(tamanho_pop):
-            # Seleciona 3 vetores (A, B, C) diferentes do parental j
-            trio = ed.seleciona3(j)
-            # Gera o vetor tentativa via mutação + crossover
-            tentativa = ed.mutacao(j, trio)
-            # Aplica a regra de substituição se o trial for melhor (menor fitness)
-            ed.substituir_se_melhor(j, tentativa)
+        ed.geracao()
 
         # Mostra o melhor da geração atual
         idx = ed.melhor_vetor()
         melhor = ed.pratos[idx]
         print(f"Melhor Vetor: {idx} - {melhor}")
-        print(f"Fitness: {EvolucaoDiferencial.fitness(melhor):.6f}")
+        print(f"Fitness: {ed.aptidoes[idx]:.6f}")
+
+    print(f"Avaliações de fitness: {ed.avaliacoes}")
+
+    # Estratégia current-to-pbest/1 com F e CR adaptativos, parando quando o
+    # melhor fitness estagna por 50 gerações
+    ed2 = EvolucaoDiferencial(tamanho=50, estrategia=PBEST1, adaptativo=True)
+    melhor = ed2.resolver(geracoes=iteracoes, paciencia=50)
+    print(f"\nAdaptativo: {melhor} - Fitness: {ed2.historico[-1]:.6f} "
+          f"({len(ed2.historico)} gerações, {ed2.avaliacoes} avaliações)")
+
+    # Modelo de ilhas: 4 populações em processos separados, com migração
+    # em anel a cada 20 gerações
+    melhor, aptidao, historicos = evolucao_ilhas(ilhas=4, tamanho=50,
+                                                 geracoes=200, semente=42,
+                                                 estrategia=PBEST1,
+                                                 adaptativo=True)
+    print(f"Ilhas: {melhor} - Fitness: {aptidao:.6f}")
+    for i, h in enumerate(historicos):
+        print(f"  Ilha {i}: {h[0]:.4f} -> {h[-1]:.6f}")
@@ -0,0 +1,56 @@
+import random
+import numpy as np
+
+# ---------------- Gerador de números aleatórios por fluxo ----------------
+class GeradorAleatorio:
+    # Serviço de números aleatórios compartilhado pelos algoritmos.
+    # Sorteios escalares (random, uniform) usam um random.Random próprio do
+    # fluxo, tão barato por chamada quanto random.random(); random e
+    # uniform são os métodos do random.Random ligados diretamente à
+    # instância, sem chamada intermediária. Sorteios em lote (randoms,
+    # shuffle, gerador) vão ao NumPy, cujo custo por chamada só compensa
+    # com muitos números de uma vez.
+    # A semente pode ser um inteiro, None (entropia do sistema) ou uma
+    # np.random.SeedSequence; os dois geradores derivam dela, e spawn()
+    # cria fluxos independentes e reprodutíveis para processos/réplicas
+    # paralelos.
+
+    def __init__(self, semente=None):
+        if isinstance(semente, np.random.SeedSequence):
+            self.sequencia = semente
+        else:
+            self.sequencia = np.random.SeedSequence(semente)
+        self.gerador = np.random.default_rng(self.sequencia)
+        estado = self.sequencia.generate_state(4, dtype=np.uint64)
+        self.escalar = random.Random(int.from_bytes(estado.tobytes(), "little"))
+        self.liga_escalares()
+
+    def liga_escalares(self):
+        # Atalhos para os sorteios escalares (ver comentário da classe)
+        self.random = self.escalar.random
+        self.uniform = self.escalar.uniform
+
+    # Os atalhos não são serializados: são religados ao escalar recebido
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        del estado['random'], estado['uniform']
+        return estado
+
+    def __setstate__(self, estado):
+        self.__dict__.update(estado)
+        self.liga_escalares()
+
+    def randoms(self, n):
+        # n números em [0, 1) de uma vez, como array NumPy
+        return self.gerador.random(n)
+
+    def shuffle(self, lista):
+        self.gerador.shuffle(lista)
+
+    def spawn(self, n):
+        # n geradores independentes derivados desta semente
+        return [GeradorAleatorio(s) for s in self.sequencia.spawn(n)]
+
+
+# Gerador usado quando nenhum é informado explicitamente
+GERADOR_PADRAO = GeradorAleatorio()
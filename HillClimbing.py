@@ -1,58 +1,176 @@
 import random
 import numpy as np
+from GeradorAleatorio import GeradorAleatorio
 
 MAX = 'MAX'
 MIN = 'MIN'
 
+# Modos de vizinhança do Hill Climbing n-dimensional
+INGREME = 'INGREME'      # steepest-ascent: melhor vizinho de toda a vizinhança
+PRIMEIRA = 'PRIMEIRA'    # first-improvement: primeiro vizinho que melhora (em blocos)
+
 # Funções objetivo
 def f1(x):
-    return -(x-3)**2 + 10
+    return -(x-3)**2 + 10
 
 def f2(x):
-    return x**2
+    return x**2
 
 def f3(x):
-    return (np.sin(5 * x) + 1) * np.exp(-((x - 5) ** 2) / 4)
+    return (np.sin(5 * x) + 1) * np.exp(-((x - 5) ** 2) / 4)
 
 def hillClimbing(f, x_inicio, passo=0.1, iteracoes=1000, limites=(-10, 10), otimizador=MIN):
-    x_atual = x_inicio
-    vl_atual = f(x_atual)
-    
-    for _ in range(iteracoes):
-        # Gera vizinhos
-        vizinhos = [x_atual + passo, x_atual - passo]
-        # Mantém vizinhos dentro dos limites
-        vizinhos = [x for x in vizinhos 
+    x_atual = x_inicio
+    vl_atual = f(x_atual)
+    
+    for _ in range(iteracoes):
+        # Gera vizinhos
+        vizinhos = [x_atual + passo, x_atual - passo]
+        # Mantém vizinhos dentro dos limites
+        vizinhos = [x for x in vizinhos 
                     if limites[0] <= x <= limites[1]]
-        vls_vizinho = [f(x) for x in vizinhos]
-        if not vls_vizinho:
-            break
-        # Escolhe melhor vizinho conforme modo de otimização
-        if otimizador == MIN:
-            melhor_vl = min(vls_vizinho)
-        else:
-            melhor_vl = max(vls_vizinho)
-        melhor_x = vizinhos[vls_vizinho.index(melhor_vl)]
-        # Atualiza se encontrou melhor vizinho
-        if (otimizador == MIN and melhor_vl < vl_atual) or (
+        vls_vizinho = [f(x) for x in vizinhos]
+        if not vls_vizinho:
+            break
+        # Escolhe melhor vizinho conforme modo de otimização
+        if otimizador == MIN:
+            melhor_vl = min(vls_vizinho)
+        else:
+            melhor_vl = max(vls_vizinho)
+        melhor_x = vizinhos[vls_vizinho.index(melhor_vl)]
+        # Atualiza se encontrou melhor vizinho
+        if (otimizador == MIN and melhor_vl < vl_atual) or (
             otimizador == MAX and melhor_vl > vl_atual):
-            x_atual = melhor_x
-            vl_atual = melhor_vl
-        else:
-            break  # Chegou em ótimo local
-    return x_atual, vl_atual
+            x_atual = melhor_x
+            vl_atual = melhor_vl
+        else:
+            break  # Chegou em ótimo local
+    return x_atual, vl_atual
+
+# Hill Climbing vetorizado: vários pontos de partida avançando juntos
+def hillClimbingVetorizado(f, x_inicios, passo=0.1, iteracoes=1000,
+                           limites=(-10, 10), otimizador=MIN):
+    # Cada posição de x_inicios é um "escalador" independente; em cada passo
+    # os vizinhos de todos os escaladores ativos são avaliados numa única
+    # chamada vetorizada de f. Retorna dois arrays (x, f(x)) do mesmo tamanho.
+    x_atual = np.array(x_inicios, dtype=float, ndmin=1)
+    vl_atual = np.asarray(f(x_atual), dtype=float).copy()
+    # Escaladores que já chegaram em ótimo local deixam de ser avaliados
+    ativos = np.ones(x_atual.shape[0], dtype=bool)
+    pior = np.inf if otimizador == MIN else -np.inf
+
+    for _ in range(iteracoes):
+        idx = np.flatnonzero(ativos)
+        if idx.size == 0:
+            break
+        # Gera vizinhos (coluna 0: x + passo, coluna 1: x - passo)
+        vizinhos = np.stack([x_atual[idx] + passo, x_atual[idx] - passo], axis=1)
+        # Avalia apenas os vizinhos dentro dos limites, numa só chamada
+        dentro = (vizinhos >= limites[0]) & (vizinhos <= limites[1])
+        vls_vizinho = np.full(vizinhos.shape, pior)
+        if dentro.any():
+            vls_vizinho[dentro] = f(vizinhos[dentro])
+        # Escolhe melhor vizinho conforme modo de otimização
+        if otimizador == MIN:
+            escolha = np.argmin(vls_vizinho, axis=1)
+        else:
+            escolha = np.argmax(vls_vizinho, axis=1)
+        linhas = np.arange(idx.size)
+        melhor_x = vizinhos[linhas, escolha]
+        melhor_vl = vls_vizinho[linhas, escolha]
+        # Atualiza quem encontrou melhor vizinho; os demais convergiram
+        if otimizador == MIN:
+            melhorou = melhor_vl < vl_atual[idx]
+        else:
+            melhorou = melhor_vl > vl_atual[idx]
+        x_atual[idx[melhorou]] = melhor_x[melhorou]
+        vl_atual[idx[melhorou]] = melhor_vl[melhorou]
+        ativos[idx[~melhorou]] = False
+    return x_atual, vl_atual
+
+# Hill Climbing n-dimensional com vizinhança avaliada em lote
+def hillClimbingND(f, x_inicio, passo=0.1, iteracoes=1000, limites=(-10, 10),
+                   otimizador=MIN, modo=INGREME, amostra=None, semente=None):
+    # f recebe uma matriz (k, n) de pontos e devolve k valores.
+    # passo e limites podem ser escalares/tupla ou por dimensão
+    # (limites com forma (n, 2)). Os 2n vizinhos (x ± passo em cada
+    # dimensão) são percorridos em ordem aleatória, em blocos de 'amostra'
+    # vizinhos avaliados numa única chamada de f; o passo usa o primeiro
+    # bloco em que algum vizinho melhora (os demais nem são avaliados):
+    #  - INGREME: melhor vizinho do bloco (amostra=None: bloco com os 2n,
+    #    ou seja, o melhor de toda a vizinhança)
+    #  - PRIMEIRA: primeiro vizinho do bloco que melhora (amostra=None:
+    #    blocos de até 16 vizinhos)
+    # Se nenhum dos 2n vizinhos melhora, chegou em ótimo local e para.
+    gerador = GeradorAleatorio(semente).gerador
+    x_atual = np.array(x_inicio, dtype=float, ndmin=1)
+    n = x_atual.shape[0]
+    passo = np.broadcast_to(np.asarray(passo, dtype=float), (n,))
+    limites = np.broadcast_to(np.asarray(limites, dtype=float), (n, 2))
+    vl_atual = float(np.asarray(f(x_atual[None, :]))[0])
+
+    # Deslocamentos dos 2n vizinhos: +passo e -passo em cada dimensão
+    deslocamentos = np.concatenate([np.diag(passo), -np.diag(passo)])
+    if amostra is None:
+        bloco = 2 * n if modo == INGREME else min(2 * n, 16)
+    else:
+        bloco = max(1, min(amostra, 2 * n))
+
+    for _ in range(iteracoes):
+        if bloco == 2 * n and modo == INGREME:
+            ordem = np.arange(2 * n)  # vizinhança inteira: ordem não importa
+        else:
+            ordem = gerador.permutation(2 * n)
+        escolhido = None
+        for inicio in range(0, 2 * n, bloco):
+            # Vizinhos do bloco que estão dentro dos limites
+            vizinhos = x_atual + deslocamentos[ordem[inicio:inicio + bloco]]
+            dentro = np.all((vizinhos >= limites[:, 0]) &
+                            (vizinhos <= limites[:, 1]), axis=1)
+            if not dentro.any():
+                continue
+            vizinhos = vizinhos[dentro]
+            vls_vizinho = np.asarray(f(vizinhos), dtype=float)
+            if otimizador == MIN:
+                melhora = vls_vizinho < vl_atual
+            else:
+                melhora = vls_vizinho > vl_atual
+            if not melhora.any():
+                continue  # Nenhuma melhora no bloco: tenta o próximo
+            if modo == PRIMEIRA:
+                escolha = np.argmax(melhora)  # primeiro na ordem aleatória
+            elif otimizador == MIN:
+                escolha = np.argmin(vls_vizinho)
+            else:
+                escolha = np.argmax(vls_vizinho)
+            escolhido = (vizinhos[escolha], float(vls_vizinho[escolha]))
+            break
+        if escolhido is None:
+            break  # Chegou em ótimo local: nenhum dos 2n vizinhos melhora
+        x_atual, vl_atual = escolhido
+    return x_atual, vl_atual
 
 # -----------------------------
 # Exemplos de execução:
 # -----------------------------
-x_inicio = random.uniform(-10, 10)
-# Maximização
-x, valor = hillClimbing(f1, x_inicio, otimizador=MAX)
-print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
-# Minimização
-x, valor = hillClimbing(f2, x_inicio, otimizador=MIN)
-print(f"Minimização -> x = {x:.4f}, f(x) = {valor:.4f}")
-# Maximização
-x, valor = hillClimbing(f3, x_inicio, otimizador=MAX)
-print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
-
+if __name__ == "__main__":
+    x_inicio = random.uniform(-10, 10)
+    # Maximização
+    x, valor = hillClimbing(f1, x_inicio, otimizador=MAX)
+    print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Minimização
+    x, valor = hillClimbing(f2, x_inicio, otimizador=MIN)
+    print(f"Minimização -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Maximização
+    x, valor = hillClimbing(f3, x_inicio, otimizador=MAX)
+    print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Maximização vetorizada a partir de vários pontos de partida
+    xs, valores = hillClimbingVetorizado(f3, np.random.uniform(-10, 10, 10000),
+                                         otimizador=MAX)
+    i = np.argmax(valores)
+    print(f"Vetorizado -> x = {xs[i]:.4f}, f(x) = {valores[i]:.4f}")
+    # Minimização n-dimensional (esfera em 50 dimensões)
+    esfera = lambda X: np.sum(X ** 2, axis=1)
+    x, valor = hillClimbingND(esfera, np.random.uniform(-10, 10, 50),
+                              iteracoes=10000, otimizador=MIN, modo=PRIMEIRA)
+    print(f"N-dimensional -> ||x|| = {np.linalg.norm(x):.4f}, f(x) = {valor:.4f}")
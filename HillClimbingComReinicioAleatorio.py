@@ -1,5 +1,8 @@
-import random
+import time
 import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+from CacheAvaliacao import CacheAvaliacao
+from GeradorAleatorio import GeradorAleatorio
 
 MAX = 'MAX'
 MIN = 'MIN'
@@ -43,15 +46,151 @@ def hillClimbing(f, x_inicio, passo=0.1, iteracoes=1000,
         break # chegou em ótimo local
     return x_atual, vl_atual
 
+# Índice de bacias de atração entre reinícios
+class IndiceBacias:
+    # Guarda, para cada ponto visitado da grade de 'passo' (x quantizado
+    # como round(x / passo)), o ótimo local a que a subida levou e quantas
+    # avaliações de f foram gastas dali até ele. Uma nova subida que pisa
+    # num ponto já indexado para na hora e reaproveita o ótimo conhecido.
+    # Os ótimos só valem para um problema: o índice fica preso a (f,
+    # limites, otimizador), informados na criação ou no primeiro uso.
+    def __init__(self, passo, f=None, limites=None, otimizador=None):
+        self.passo = passo
+        self.f = f
+        self.limites = None if limites is None else tuple(limites)
+        self.otimizador = otimizador
+        self.pontos = {}        # chave da grade -> (x_otimo, vl_otimo, avaliações)
+        self.economizadas = 0   # avaliações de f evitadas
+        self.abortados = 0      # subidas interrompidas por cair em bacia conhecida
+
+    def confere(self, f, passo, limites, otimizador):
+        # Prende o índice ao problema no primeiro uso; depois, recusa
+        # subidas de outro problema ou com outro passo
+        if self.f is None:
+            self.f = f
+            self.limites = tuple(limites)
+            self.otimizador = otimizador
+        if passo != self.passo:
+            raise ValueError(f"índice de bacias com passo {self.passo}, "
+                             f"mas a subida pediu passo {passo}")
+        if (f is not self.f or tuple(limites) != self.limites or
+                otimizador != self.otimizador):
+            raise ValueError("índice de bacias criado para outro problema "
+                             "(f, limites ou otimizador diferentes)")
+
+    def chave(self, x):
+        return round(x / self.passo)
+
+    def hillClimbing(self, f, x_inicio, iteracoes=1000, limites=(-10, 10),
+                     otimizador=MIN):
+        passo = self.passo
+        x_atual, vl_atual = x_inicio, None
+        avaliacoes = 0
+        restantes = 0        # avaliações herdadas de uma subida anterior
+        convergiu = False
+        caminho = []         # (chave, avaliações feitas ao chegar no ponto)
+        for _ in range(iteracoes):
+          chave = self.chave(x_atual)
+          conhecido = self.pontos.get(chave)
+          if conhecido is not None:
+            # Bacia já escalada: reaproveita o ótimo local conhecido
+            x_atual, vl_atual, restantes = conhecido
+            self.economizadas += restantes
+            self.abortados += 1
+            convergiu = True
+            break
+          caminho.append((chave, avaliacoes))
+          if vl_atual is None:
+            vl_atual = f(x_atual)
+            avaliacoes += 1
+          vizinhos = [x for x in [x_atual + passo, x_atual - passo]
+                      if limites[0] <= x <= limites[1]]
+          vls_vizinho = [f(x) for x in vizinhos]
+          avaliacoes += len(vizinhos)
+          if not vls_vizinho:
+            convergiu = True
+            break
+          if otimizador == MIN:
+            melhor_vl = min(vls_vizinho)
+          else:
+            melhor_vl = max(vls_vizinho)
+          melhor_x = vizinhos[vls_vizinho.index(melhor_vl)]
+          if (otimizador == MIN and melhor_vl < vl_atual) or (
+            otimizador == MAX and melhor_vl > vl_atual):
+            x_atual = melhor_x
+            vl_atual = melhor_vl
+          else:
+            convergiu = True  # chegou em ótimo local
+            break
+        if vl_atual is None:
+          vl_atual = f(x_atual)
+        # Só indexa o caminho se ele realmente terminou num ótimo local
+        if convergiu:
+          total = avaliacoes + restantes
+          for chave, feitas in caminho:
+            self.pontos.setdefault(chave, (x_atual, vl_atual, total - feitas))
+        return x_atual, vl_atual
+
+    def __repr__(self):
+        return (f"IndiceBacias(pontos={len(self.pontos)}, "
+                f"abortados={self.abortados}, economizadas={self.economizadas})")
+
+# Sementes independentes e deriváveis, uma por reinício
+def sementesReinicios(semente, reinicios):
+    filhas = np.random.SeedSequence(semente).spawn(reinicios)
+    return [int(s.generate_state(1)[0]) for s in filhas]
+
+# Um reinício completo: sorteia o ponto inicial com sua própria semente
+def executaReinicio(f, semente, passo, iteracoes, limites, otimizador,
+                    indice=None):
+    x_inicio = GeradorAleatorio(semente).uniform(limites[0], limites[1])
+    if indice is not None:
+      return indice.hillClimbing(f, x_inicio, iteracoes, limites, otimizador)
+    return hillClimbing(f, x_inicio, passo, iteracoes, limites, otimizador)
+
 # Hill Climbing com Reinício Aleatório
+# cache: None (sem cache), True (cache novo para esta chamada) ou uma
+# instância de CacheAvaliacao de f compartilhada entre chamadas
+# processos: quantidade de processos que executam os reinícios em paralelo
+# semente: semente base; o resultado é idêntico para qualquer 'processos'
+# indice: None, True (índice novo) ou uma instância de IndiceBacias do
+# mesmo problema e 'passo'; subidas que caem numa bacia já escalada param
+# cedo (ver IndiceBacias.economizadas)
 def hillClimbingReinicioAleatorio(f, reinicios=10, passo=0.1, iteracoes=1000,
-                                  limites=(-10, 10), otimizador=MIN):
+                                  limites=(-10, 10), otimizador=MIN, cache=None,
+                                  processos=1, semente=None, indice=None):
+    if indice is True:
+      indice = IndiceBacias(passo)
+    if indice is not None:
+      if processos > 1:
+        raise ValueError("índice de bacias exige processos=1")
+      # confere com f original (antes de trocar f pelo cache)
+      indice.confere(f, passo, limites, otimizador)
+    if cache is True:
+      cache = CacheAvaliacao(f)
+    if cache is not None:
+      if processos > 1:
+        # cada processo teria sua própria cópia e os contadores se perderiam
+        raise ValueError("cache compartilhado exige processos=1")
+      if cache.f is not f:
+        # valores memorizados de outra função dariam o ótimo errado
+        raise ValueError("o cache informado não é da função f")
+      f = cache  # todos os reinícios consultam o mesmo cache
+    sementes = sementesReinicios(semente, reinicios)
+    n = len(sementes)
+    args = ([f] * n, sementes, [passo] * n, [iteracoes] * n,
+            [limites] * n, [otimizador] * n, [indice] * n)
+    if processos > 1:
+      with ProcessPoolExecutor(max_workers=processos) as pool:
+        resultados = list(pool.map(executaReinicio, *args,
+                                   chunksize=max(1, n // (4 * processos))))
+    else:
+      resultados = map(executaReinicio, *args)
+
+    # Redução na ordem dos reinícios (empates ficam com o primeiro)
     melhor_x = None
     melhor_valor = None
-    for _ in range(reinicios):
-      x_inicio = random.uniform(limites[0], limites[1])
-      x, valor = hillClimbing(f, x_inicio, passo, iteracoes, 
-                                limites, otimizador)
+    for x, valor in resultados:
       if melhor_x is None:
         melhor_x, melhor_valor = x, valor
       else:
@@ -60,12 +199,97 @@ def hillClimbingReinicioAleatorio(f, reinicios=10, passo=0.1, iteracoes=1000,
           melhor_x, melhor_valor = x, valor
     return melhor_x, melhor_valor
 
-# Maximização
-x, valor = hillClimbingReinicioAleatorio(f1, reinicios=20, otimizador=MAX)
-print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
-# Minimização
-x, valor = hillClimbingReinicioAleatorio(f2, reinicios=20, otimizador=MIN)
-print(f"Minimização -> x = {x:.4f}, f(x) = {valor:.4f}")
-# Maximização
-x, valor = hillClimbingReinicioAleatorio(f3, reinicios=20, otimizador=MAX)
-print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
\ No newline at end of file
+# Hill Climbing com reinícios "anytime": gerador que produz o melhor
+# (x, valor) encontrado até o momento sempre que ele melhora.
+# Para quando acaba o tempo (tempo_max, em segundos), o número de
+# avaliações de f (avaliacoes_max) ou os reinícios, o que vier primeiro.
+# O orçamento é checado antes de cada avaliação, inclusive no meio de uma
+# subida. Com a mesma semente, os pontos iniciais são os mesmos de
+# hillClimbingReinicioAleatorio.
+def hillClimbingReinicioAnytime(f, passo=0.1, iteracoes=1000, limites=(-10, 10),
+                                otimizador=MIN, tempo_max=None,
+                                avaliacoes_max=None, reinicios=None,
+                                semente=None):
+    if tempo_max is None and avaliacoes_max is None and reinicios is None:
+      raise ValueError("informe tempo_max, avaliacoes_max ou reinicios")
+    prazo = None if tempo_max is None else time.perf_counter() + tempo_max
+    sementes = np.random.SeedSequence(semente)
+    avaliacoes = 0
+    melhor_valor = None
+
+    def esgotado():
+      return (avaliacoes_max is not None and avaliacoes >= avaliacoes_max) or (
+        prazo is not None and time.perf_counter() >= prazo)
+
+    def melhorou(valor):
+      return melhor_valor is None or (otimizador == MIN and valor < melhor_valor) or (
+        otimizador == MAX and valor > melhor_valor)
+
+    r = 0
+    while reinicios is None or r < reinicios:
+      if esgotado():
+        return
+      r += 1
+      # mesma derivação de sementes que sementesReinicios
+      semente_r = int(sementes.spawn(1)[0].generate_state(1)[0])
+      x_atual = GeradorAleatorio(semente_r).uniform(limites[0], limites[1])
+      vl_atual = f(x_atual)
+      avaliacoes += 1
+      if melhorou(vl_atual):
+        melhor_valor = vl_atual
+        yield x_atual, vl_atual
+      for _ in range(iteracoes):
+        # Avalia os vizinhos enquanto houver orçamento
+        vizinhos = []
+        vls_vizinho = []
+        for x in [x_atual + passo, x_atual - passo]:
+          if limites[0] <= x <= limites[1] and not esgotado():
+            vizinhos.append(x)
+            vls_vizinho.append(f(x))
+            avaliacoes += 1
+        if not vls_vizinho:
+          break
+        if otimizador == MIN:
+          melhor_vl = min(vls_vizinho)
+        else:
+          melhor_vl = max(vls_vizinho)
+        melhor_x = vizinhos[vls_vizinho.index(melhor_vl)]
+        if (otimizador == MIN and melhor_vl < vl_atual) or (
+          otimizador == MAX and melhor_vl > vl_atual):
+          x_atual = melhor_x
+          vl_atual = melhor_vl
+          if melhorou(vl_atual):
+            melhor_valor = vl_atual
+            yield x_atual, vl_atual
+        else:
+          break # chegou em ótimo local
+
+if __name__ == "__main__":
+    # Maximização
+    x, valor = hillClimbingReinicioAleatorio(f1, reinicios=20, otimizador=MAX)
+    print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Minimização
+    x, valor = hillClimbingReinicioAleatorio(f2, reinicios=20, otimizador=MIN)
+    print(f"Minimização -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Maximização
+    x, valor = hillClimbingReinicioAleatorio(f3, reinicios=20, otimizador=MAX)
+    print(f"Maximização -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Maximização com cache compartilhado entre os reinícios
+    cache = CacheAvaliacao(f3)
+    x, valor = hillClimbingReinicioAleatorio(f3, reinicios=20, otimizador=MAX,
+                                             cache=cache)
+    print(f"Com cache -> x = {x:.4f}, f(x) = {valor:.4f} {cache}")
+    # Reinícios em paralelo: mesmo resultado com 1 ou vários processos
+    x, valor = hillClimbingReinicioAleatorio(f3, reinicios=200, otimizador=MAX,
+                                             processos=4, semente=42)
+    print(f"Paralelo -> x = {x:.4f}, f(x) = {valor:.4f}")
+    # Reinícios com índice de bacias: subidas redundantes param cedo
+    indice = IndiceBacias(0.1)
+    x, valor = hillClimbingReinicioAleatorio(f3, reinicios=200, otimizador=MAX,
+                                             indice=indice)
+    print(f"Com índice -> x = {x:.4f}, f(x) = {valor:.4f} {indice}")
+    # Anytime: melhor resposta possível em até 50 ms
+    for x, valor in hillClimbingReinicioAnytime(f3, otimizador=MAX,
+                                                tempo_max=0.05):
+      pass
+    print(f"Anytime (50 ms) -> x = {x:.4f}, f(x) = {valor:.4f}")
@@ -0,0 +1,242 @@
+import csv
+import mmap
+import os
+from array import array
+from typing import List, Optional, Sequence
+import numpy as np
+
+# Composição dos 5 alimentos do problema original (linhas) em carboidratos,
+# proteínas e gorduras (colunas), por unidade de quantidade do alimento.
+NUTRIENTES = np.array([
+    [0.05, 0.23,  0.05 ],
+    [0.24, 0.02,  0.00 ],
+    [0.26, 0.026, 0.01 ],
+    [0.15, 0.13,  0.089],
+    [0.29, 0.095, 0.014],
+])
+# Proporções ideais da refeição (%): 55 carboidratos, 30 proteínas, 15 gorduras
+ALVOS = np.array([55.0, 30.0, 15.0])
+
+
+def erro_proporcoes(macros: np.ndarray, alvos: np.ndarray) -> np.ndarray:
+    # Soma das diferenças absolutas entre a proporção (%) de cada nutriente
+    # no total de cada prato (linhas de 'macros') e o alvo
+    total = macros.sum(axis=1)
+
+    # Evita divisão por zero (se tudo zerado). Penaliza fortemente esse caso.
+    zerado = total <= 1e-12
+    total = np.where(zerado, 1.0, total)
+
+    # Converte para porcentagens e soma as diferenças para os alvos
+    porcoes = macros / total[:, None] * 100.0
+    diff_total = np.abs(porcoes - alvos).sum(axis=1)
+    return np.where(zerado, 1e9, diff_total)
+
+
+def fitness_pratos(matriz: np.ndarray, dados: dict) -> np.ndarray:
+    # Mesmo fitness de ProblemaDieta.fitness_lote a partir de
+    # ProblemaDieta.dados(), para uso com o Avaliador (vetorizada=True)
+    return erro_proporcoes(np.asarray(matriz) @ dados["nutrientes"],
+                           dados["alvos"])
+
+
+# ------------------------- Classe ProblemaDieta -------------------------
+class ProblemaDieta:
+    # Definição de um problema de dieta:
+    #  - nutrientes: tabela (alimentos x nutrientes) com a quantidade de cada
+    #    nutriente por unidade de alimento; pode ser um ndarray, um memmap
+    #    (tabelas carregadas do disco) ou uma matriz esparsa do SciPy
+    #  - alvos: proporção ideal (%) de cada nutriente no total do prato
+    #  - minimos/maximos: limites da quantidade de cada alimento
+    #    (escalares ou um valor por alimento)
+    # A dimensão do prato (número de genes) é o número de alimentos.
+
+    def __init__(self, nutrientes, alvos: Sequence[float],
+                 minimos=0.0, maximos=np.inf,
+                 nomes: Optional[List[str]] = None,
+                 fonte_nomes: Optional[tuple] = None):
+        self.nutrientes = nutrientes
+        self.alvos = np.asarray(alvos, dtype=float)
+        d = nutrientes.shape[0]
+        self.minimos = np.broadcast_to(np.asarray(minimos, dtype=float), (d,))
+        self.maximos = np.broadcast_to(np.asarray(maximos, dtype=float), (d,))
+        self.nomes_carregados = nomes
+        # (arquivo, coluna) de onde os nomes são lidos quando pedidos;
+        # coluna None indica um arquivo texto com um nome por linha
+        self.fonte_nomes = fonte_nomes
+
+    # Ao ser enviado para outro processo, uma tabela mapeada em memória vai
+    # como (arquivo, tipo, forma, deslocamento) e é mapeada de novo do outro
+    # lado, em vez de ser copiada inteira
+    def __getstate__(self):
+        estado = self.__dict__.copy()
+        tabela = self.nutrientes
+        if isinstance(tabela, np.memmap) and isinstance(tabela.base, mmap.mmap) \
+                and tabela.filename is not None:
+            estado["nutrientes"] = ("memmap", tabela.filename, tabela.dtype.str,
+                                    tabela.shape, tabela.offset)
+        return estado
+
+    def __setstate__(self, estado):
+        tabela = estado["nutrientes"]
+        if isinstance(tabela, tuple) and tabela[0] == "memmap":
+            arquivo, tipo, forma, deslocamento = tabela[1:]
+            estado["nutrientes"] = np.memmap(arquivo, dtype=tipo, mode="r",
+                                             shape=forma, offset=deslocamento)
+        self.__dict__.update(estado)
+
+    @property
+    def dimensao(self) -> int:
+        return self.nutrientes.shape[0]
+
+    @property
+    def nomes(self) -> List[str]:
+        # Nomes dos alimentos, carregados sob demanda
+        if self.nomes_carregados is None:
+            if self.fonte_nomes is None:
+                self.nomes_carregados = [f"alimento {i}" for i in range(self.dimensao)]
+            elif self.fonte_nomes[1] is None:
+                with open(self.fonte_nomes[0], encoding="utf-8") as arq:
+                    self.nomes_carregados = arq.read().splitlines()
+            else:
+                # CSV: lido com o módulo csv (respeita nomes entre aspas)
+                caminho, coluna = self.fonte_nomes
+                with open(caminho, newline="", encoding="utf-8") as arq:
+                    leitor = csv.reader(arq)
+                    next(leitor)
+                    self.nomes_carregados = [linha[coluna] for linha in leitor
+                                             if linha]
+        return self.nomes_carregados
+
+    # ---------- Avaliação ----------
+    def fitness_lote(self, matriz: np.ndarray) -> np.ndarray:
+        # Fitness de vários pratos de uma vez (uma linha por prato): soma das
+        # diferenças absolutas entre a proporção (%) de cada nutriente no
+        # total e o alvo. Quanto MENOR, MELHOR (minimização).
+        # (N, alimentos) @ (alimentos, nutrientes) -> (N, nutrientes)
+        nutrientes = self.nutrientes
+        if hasattr(nutrientes, "tocsr"):
+            # SciPy esparso: (S.T @ X.T).T evita converter a tabela para densa
+            macros = np.asarray((nutrientes.T @ matriz.T).T)
+        else:
+            macros = matriz @ nutrientes
+        return erro_proporcoes(macros, self.alvos)
+
+    def dados(self) -> dict:
+        # Arrays do problema para o Avaliador (densos, para poderem ir para
+        # memória compartilhada)
+        tabela = self.nutrientes
+        if hasattr(tabela, "toarray"):
+            tabela = tabela.toarray()
+        return {"nutrientes": np.asarray(tabela, dtype=float),
+                "alvos": self.alvos}
+
+    def limita(self, matriz: np.ndarray) -> np.ndarray:
+        # Trunca (no lugar) as quantidades nos limites de cada alimento
+        return np.clip(matriz, self.minimos, self.maximos, out=matriz)
+
+    def aleatorios(self, n: int, rng) -> np.ndarray:
+        # n pratos uniformes nos limites de cada alimento; alimentos sem
+        # máximo finito usam [minimo, minimo + 200) como no problema original
+        topo = np.where(np.isfinite(self.maximos), self.maximos,
+                        self.minimos + 200.0)
+        return self.minimos + rng.randoms((n, self.dimensao)) * (topo - self.minimos)
+
+    # ---------- Construção ----------
+    @classmethod
+    def padrao(cls) -> "ProblemaDieta":
+        # Problema original: 5 alimentos, alvos 55/30/15, quantidades >= 0
+        return cls(NUTRIENTES, ALVOS)
+
+    @staticmethod
+    def ajusta_esparsidade(tabela, esparso: Optional[bool]):
+        # esparso=None escolhe sozinho: usa SciPy esparso se a tabela tiver
+        # menos de 10% de valores não nulos (e o SciPy estiver instalado)
+        if esparso is None:
+            if tabela.size == 0 or np.count_nonzero(tabela) / tabela.size >= 0.1:
+                return tabela
+            try:
+                from scipy import sparse
+            except ImportError:
+                return tabela
+            return sparse.csr_matrix(tabela)
+        if esparso:
+            from scipy import sparse
+            return sparse.csr_matrix(tabela)
+        return tabela
+
+    def salvar(self, pasta: str) -> None:
+        # Formato binário: uma pasta com arquivos .npy (abertos depois por
+        # memory-map) e os nomes dos alimentos em texto, um por linha
+        os.makedirs(pasta, exist_ok=True)
+        tabela = self.nutrientes
+        if hasattr(tabela, "toarray"):
+            tabela = tabela.toarray()
+        np.save(os.path.join(pasta, "nutrientes.npy"), np.asarray(tabela))
+        np.save(os.path.join(pasta, "alvos.npy"), self.alvos)
+        np.save(os.path.join(pasta, "limites.npy"),
+                np.column_stack([self.minimos, self.maximos]))
+        with open(os.path.join(pasta, "nomes.txt"), "w", encoding="utf-8") as arq:
+            arq.write("\n".join(self.nomes))
+
+    @classmethod
+    def carregar(cls, pasta: str, esparso: Optional[bool] = False) -> "ProblemaDieta":
+        # Abre uma pasta gravada por salvar(); a tabela de nutrientes é
+        # mapeada em memória (só as páginas usadas são lidas do disco)
+        tabela = np.load(os.path.join(pasta, "nutrientes.npy"), mmap_mode="r")
+        alvos = np.load(os.path.join(pasta, "alvos.npy"))
+        limites = np.load(os.path.join(pasta, "limites.npy"), mmap_mode="r")
+        return cls(cls.ajusta_esparsidade(tabela, esparso), alvos,
+                   limites[:, 0], limites[:, 1],
+                   fonte_nomes=(os.path.join(pasta, "nomes.txt"), None))
+
+    @classmethod
+    def de_csv(cls, caminho: str, alvos: dict,
+               esparso: Optional[bool] = None) -> "ProblemaDieta":
+        # CSV com cabeçalho: coluna 'nome', uma coluna por nutriente e,
+        # opcionalmente, colunas 'minimo' e 'maximo' por alimento.
+        # alvos: {nome do nutriente: proporção ideal (%)}; só os nutrientes
+        # com alvo entram no fitness. O arquivo é lido numa única passada
+        # com o módulo csv (campos entre aspas, como "Arroz, cozido", são
+        # respeitados) e as colunas numéricas vão direto para um array
+        # contíguo (sem criar objetos por linha); os nomes ficam para
+        # quando forem pedidos.
+        valores = array("d")
+        with open(caminho, newline="", encoding="utf-8") as arq:
+            leitor = csv.reader(arq)
+            cabecalho = next(leitor)
+            extras = [c for c in ("minimo", "maximo") if c in cabecalho]
+            colunas = [cabecalho.index(n) for n in list(alvos) + extras]
+            for linha in leitor:
+                if linha:
+                    valores.extend(float(linha[c]) for c in colunas)
+        dados = np.frombuffer(valores).reshape(-1, len(colunas))
+        tabela = dados[:, :len(alvos)]
+        minimos = dados[:, len(alvos) + extras.index("minimo")] \
+            if "minimo" in extras else 0.0
+        maximos = dados[:, len(alvos) + extras.index("maximo")] \
+            if "maximo" in extras else np.inf
+        fonte = ((caminho, cabecalho.index("nome"))
+                 if "nome" in cabecalho else None)
+        return cls(cls.ajusta_esparsidade(np.ascontiguousarray(tabela), esparso),
+                   list(alvos.values()), minimos, maximos, fonte_nomes=fonte)
+
+    @classmethod
+    def de_parquet(cls, caminho: str, alvos: dict,
+                   esparso: Optional[bool] = None) -> "ProblemaDieta":
+        # Mesmo layout do CSV, em Parquet (requer pyarrow); só as colunas
+        # necessárias são lidas
+        import pyarrow.parquet as pq
+        esquema = pq.read_schema(caminho).names
+        extras = [c for c in ("minimo", "maximo", "nome") if c in esquema]
+        tabela_pq = pq.read_table(caminho, columns=list(alvos) + extras)
+        tabela = np.column_stack([tabela_pq.column(n).to_numpy()
+                                  for n in alvos]).astype(float)
+        minimos = (tabela_pq.column("minimo").to_numpy()
+                   if "minimo" in extras else 0.0)
+        maximos = (tabela_pq.column("maximo").to_numpy()
+                   if "maximo" in extras else np.inf)
+        nomes = (tabela_pq.column("nome").to_pylist()
+                 if "nome" in extras else None)
+        return cls(cls.ajusta_esparsidade(tabela, esparso),
+                   list(alvos.values()), minimos, maximos, nomes=nomes)
@@ -1,10 +1,16 @@
-import random
 import numpy as np
 import math
+from GeradorAleatorio import GeradorAleatorio, GERADOR_PADRAO
+from concurrent.futures import ProcessPoolExecutor
 
 MAX = 'MAX'
 MIN = 'MIN'
 
+# Tratamento de propostas fora dos limites
+REFLETIR = 'REFLETIR'      # espelha a proposta na borda do intervalo
+REAMOSTRAR = 'REAMOSTRAR'  # sorteia outro passo até cair dentro
+DESCARTAR = 'DESCARTAR'    # ignora a proposta (comportamento antigo)
+
 # Funções objetivo
 def f1(x):
     return -(x-3)**2 + 10  # Parabólica invertida (máx em x=3)
@@ -15,59 +21,319 @@ def f2(x):
 def f3(x):
     return (np.sin(5 * x) + 1) * np.exp(-((x - 5) ** 2) / 4)
 
+# ---------------- Esquemas de resfriamento ----------------
+# Cada esquema recebe, ao fim de um patamar de temperatura, a temperatura
+# atual T, o número k de patamares já concluídos (desde o início ou desde o
+# último reaquecimento) e a taxa de aceitação observada no patamar, e
+# devolve a próxima temperatura.
+
+class ResfriamentoGeometrico:
+    # T <- alpha * T
+    def __init__(self, alpha=0.99):
+        self.alpha = alpha
+
+    def proxima(self, T, k, taxa_aceitacao):
+        return T * self.alpha
+
+class ResfriamentoLogaritmico:
+    # T_k = T_0 / ln(k + e), com T_0 a temperatura no início do resfriamento
+    # (ou no último reaquecimento), calculada a partir de T e k. Decai muito
+    # devagar: só pode ser usado com avaliacoes_max.
+    def proxima(self, T, k, taxa_aceitacao):
+        return T * math.log(k + math.e) / math.log(k + 1 + math.e)
+
+class ResfriamentoLundyMees:
+    # T <- T / (1 + beta * T), isto é, 1/T_k = 1/T_0 + k * beta: de 100 a
+    # 1e-3 leva cerca de 1000 patamares com beta=1 (como o geométrico padrão)
+    def __init__(self, beta=1.0):
+        self.beta = beta
+
+    def proxima(self, T, k, taxa_aceitacao):
+        return T / (1 + self.beta * T)
+
+class ResfriamentoAdaptativo:
+    # Resfria rápido (T * alpha) enquanto a taxa de aceitação está acima do
+    # alvo e devagar (T * alpha ** lentidao) quando fica abaixo dele, gastando
+    # mais patamares na faixa de temperatura em que a busca é seletiva.
+    def __init__(self, alvo=0.3, alpha=0.9, lentidao=0.1):
+        self.alvo = alvo
+        self.alpha = alpha
+        self.lentidao = lentidao
+
+    def proxima(self, T, k, taxa_aceitacao):
+        if taxa_aceitacao > self.alvo:
+            return T * self.alpha
+        return T * self.alpha ** self.lentidao
+
+# Critério de Metropolis: aceita melhoras sempre e pioras com
+# probabilidade exp(-|delta| / T). rng é um GeradorAleatorio.
+def aceitaMetropolis(delta, T, otimizador, rng=GERADOR_PADRAO):
+    if otimizador == MAX:
+        return delta > 0 or math.exp(delta / T) > rng.random()
+    return delta < 0 or math.exp(-delta / T) > rng.random()
+
+# Gera um vizinho aleatório próximo de x_atual, tratando propostas fora
+# dos limites conforme fora_limites (None quando a proposta é descartada)
+def vizinho(x_atual, limites, fora_limites=REFLETIR, rng=GERADOR_PADRAO):
+    x_novo = x_atual + rng.uniform(-0.5, 0.5)
+    if limites[0] <= x_novo <= limites[1]:
+        return x_novo
+    return corrigeProposta(x_atual, x_novo, limites, fora_limites, rng)
+
+# Trata uma proposta x_novo que caiu fora dos limites
+def corrigeProposta(x_atual, x_novo, limites, fora_limites, rng):
+    if fora_limites == DESCARTAR:
+        return None
+    if fora_limites == REAMOSTRAR:
+        while not (limites[0] <= x_novo <= limites[1]):
+            x_novo = x_atual + rng.uniform(-0.5, 0.5)
+        return x_novo
+    # Reflete na borda ultrapassada
+    if x_novo < limites[0]:
+        x_novo = 2 * limites[0] - x_novo
+    else:
+        x_novo = 2 * limites[1] - x_novo
+    return min(max(x_novo, limites[0]), limites[1])
+
 # Simulated Annealing
+# resfriamento: esquema de resfriamento (padrão: geométrico com 'alpha')
+# avaliacoes_max: orçamento total de avaliações de f (None = sem limite)
+# fora_limites: REFLETIR, REAMOSTRAR ou DESCARTAR propostas fora de 'limites'
+# reaquecer_apos: patamares sem melhorar a melhor solução antes de voltar a
+#   temperatura para T_inicial * fator_reaquecimento (None = nunca reaquece)
+# Reaquecimento e os esquemas logarítmico e Lundy-Mees exigem avaliacoes_max:
+# sem orçamento a temperatura pode nunca chegar a T_final.
 def simulatedAnnealing(f, limites=(-10, 10), otimizador=MAX,
-                        T_inicial=100, T_final=1e-3, alpha=0.99, iteracoes=1000):
+                        T_inicial=100, T_final=1e-3, alpha=0.99, iteracoes=1000,
+                        resfriamento=None, avaliacoes_max=None,
+                        fora_limites=REFLETIR, reaquecer_apos=None,
+                        fator_reaquecimento=0.5, semente=None):
+    if resfriamento is None:
+        resfriamento = ResfriamentoGeometrico(alpha)
+    if avaliacoes_max is None and (
+            reaquecer_apos is not None or
+            isinstance(resfriamento, (ResfriamentoLogaritmico,
+                                      ResfriamentoLundyMees))):
+        raise ValueError("reaquecer_apos e os resfriamentos logarítmico e "
+                         "Lundy-Mees exigem avaliacoes_max")
+    rng = GeradorAleatorio(semente)
     
     # Ponto inicial aleatório
-    x_atual = random.uniform(limites[0], limites[1])
+    x_atual = rng.uniform(limites[0], limites[1])
     vl_atual = f(x_atual)
+    avaliacoes = 1
     
     melhor_x, melhor_val = x_atual, vl_atual
     
     T = T_inicial
+    k = 0                # patamares concluídos desde o início/reaquecimento
+    sem_melhora = 0      # patamares seguidos sem melhorar a melhor solução
     
+    # Laço interno enxuto (vizinho e aceitaMetropolis em linha): sorteios
+    # escalares direto do random.Random do fluxo e o sentido da otimização
+    # como sinal (ganho = sinal * delta > 0 é melhora)
+    aleatorio, exp = rng.random, math.exp
+    inf, sup = limites[0], limites[1]
+    sinal = 1 if otimizador == MAX else -1
+    limite_avaliacoes = math.inf if avaliacoes_max is None else avaliacoes_max
+
     while T > T_final:
+        aceitos = 0
+        propostas = 0
+        melhorou = False
         for _ in range(iteracoes):
-            # Gera um vizinho aleatório próximo
-            passo = random.uniform(-0.5, 0.5)
-            x_novo = x_atual + passo
-            if not (limites[0] <= x_novo <= limites[1]):
-                continue
+            if avaliacoes >= limite_avaliacoes:
+                return melhor_x, melhor_val
+            # Gera um vizinho aleatório próximo (passo uniforme em [-0.5, 0.5))
+            x_novo = x_atual + (aleatorio() - 0.5)
+            if not (inf <= x_novo <= sup):
+                x_novo = corrigeProposta(x_atual, x_novo, limites,
+                                         fora_limites, rng)
+                if x_novo is None:
+                    continue
 
             vl_novo = f(x_novo)
-            delta = vl_novo - vl_atual
+            avaliacoes += 1
+            propostas += 1
+            ganho = sinal * (vl_novo - vl_atual)
 
-            if otimizador == MAX:
-                aceita = delta > 0 or math.exp(delta / T) > random.random()
-            else:
-                aceita = delta < 0 or math.exp(-delta / T) > random.random()
-
-            if aceita:
+            # Critério de Metropolis (ver aceitaMetropolis)
+            if ganho > 0 or exp(ganho / T) > aleatorio():
                 x_atual, vl_atual = x_novo, vl_novo
+                aceitos += 1
 
                 # Atualiza melhor solução
-                if (otimizador == MAX and vl_atual > melhor_val) or (
-                    otimizador == MIN and vl_atual < melhor_val):
+                if sinal * (vl_atual - melhor_val) > 0:
                     melhor_x, melhor_val = x_atual, vl_atual
+                    melhorou = True
 
         # Resfriamento
-        T *= alpha
+        taxa_aceitacao = aceitos / propostas if propostas else 0.0
+        T = resfriamento.proxima(T, k, taxa_aceitacao)
+        k += 1
+
+        # Reaquecimento opcional quando a busca estagna
+        sem_melhora = 0 if melhorou else sem_melhora + 1
+        if reaquecer_apos is not None and sem_melhora >= reaquecer_apos:
+            T = T_inicial * fator_reaquecimento
+            k = 0
+            sem_melhora = 0
     
     return melhor_x, melhor_val
 
+# ---------------- Parallel tempering (troca de réplicas) ----------------
+# Executa 'passos' passos de Metropolis de uma réplica na temperatura fixa T.
+# Roda num processo do pool com seu próprio GeradorAleatorio (rng).
+def executaReplica(f, x_atual, vl_atual, T, passos, limites, otimizador,
+                   fora_limites, rng):
+    melhor_x, melhor_val = x_atual, vl_atual
+    for _ in range(passos):
+        x_novo = vizinho(x_atual, limites, fora_limites, rng)
+        if x_novo is None:
+            continue
+        vl_novo = f(x_novo)
+        if aceitaMetropolis(vl_novo - vl_atual, T, otimizador, rng):
+            x_atual, vl_atual = x_novo, vl_novo
+            if (otimizador == MAX and vl_atual > melhor_val) or (
+                otimizador == MIN and vl_atual < melhor_val):
+                melhor_x, melhor_val = x_atual, vl_atual
+    return x_atual, vl_atual, melhor_x, melhor_val
+
+# Parallel tempering: 'replicas' cadeias em temperaturas fixas (escala
+# geométrica entre T_min e T_max, ou a lista 'temperaturas'), distribuídas
+# em 'processos' processos. A cada 'passos_troca' passos, réplicas de
+# temperaturas vizinhas tentam trocar de estado (pares pares/ímpares
+# alternados), com aceitação de Metropolis sobre
+# delta = (f_j - f_i) * (1/T_i - 1/T_j).
+# Retorna o melhor (x, f(x)) e a taxa de aceitação das trocas de cada par
+# (T_i, T_i+1). Com a mesma semente o resultado independe de 'processos'.
+def parallelTempering(f, limites=(-10, 10), otimizador=MAX, replicas=8,
+                      T_min=1e-2, T_max=10, temperaturas=None, rodadas=100,
+                      passos_troca=100, fora_limites=REFLETIR, processos=1,
+                      semente=None):
+    if temperaturas is None:
+        temperaturas = list(np.geomspace(T_min, T_max, replicas))
+    n = len(temperaturas)
+    rng = GeradorAleatorio(semente)
+
+    xs = [rng.uniform(limites[0], limites[1]) for _ in range(n)]
+    vls = [f(x) for x in xs]
+    melhor_x, melhor_val = xs[0], vls[0]
+    tentativas = [0] * (n - 1)
+    trocas = [0] * (n - 1)
+
+    pool = ProcessPoolExecutor(max_workers=processos) if processos > 1 else None
+    try:
+        for rodada in range(rodadas):
+            # Evolui todas as réplicas em paralelo
+            args = ([f] * n, xs, vls, temperaturas, [passos_troca] * n,
+                    [limites] * n, [otimizador] * n, [fora_limites] * n,
+                    rng.spawn(n))
+            if pool is not None:
+                resultados = list(pool.map(executaReplica, *args))
+            else:
+                resultados = list(map(executaReplica, *args))
+            xs = [r[0] for r in resultados]
+            vls = [r[1] for r in resultados]
+            for _, _, x, vl in resultados:
+                if (otimizador == MAX and vl > melhor_val) or (
+                    otimizador == MIN and vl < melhor_val):
+                    melhor_x, melhor_val = x, vl
+
+            # Tenta trocar estados entre temperaturas vizinhas
+            for i in range(rodada % 2, n - 1, 2):
+                j = i + 1
+                delta = (vls[j] - vls[i]) * (1 / temperaturas[i] -
+                                             1 / temperaturas[j])
+                tentativas[i] += 1
+                if aceitaMetropolis(delta, 1.0, otimizador, rng):
+                    xs[i], xs[j] = xs[j], xs[i]
+                    vls[i], vls[j] = vls[j], vls[i]
+                    trocas[i] += 1
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    taxas_troca = [t / a if a else 0.0 for t, a in zip(trocas, tentativas)]
+    return melhor_x, melhor_val, taxas_troca
+
+# Simulated Annealing com várias cadeias em paralelo (vetorizado)
+def simulatedAnnealingVetorizado(f, cadeias=1000, limites=(-10, 10),
+                                 otimizador=MAX, T_inicial=100, T_final=1e-3,
+                                 alpha=0.99, iteracoes=1000, semente=None):
+    # Executa 'cadeias' cadeias de Markov independentes como arrays NumPy:
+    # proposta, checagem de limites, avaliação de f e aceitação de
+    # Metropolis são uma operação vetorizada por iteração.
+    # Retorna o melhor (x, f(x)) entre todas as cadeias e os arrays com o
+    # melhor x e f(x) de cada cadeia.
+    sinal = 1.0 if otimizador == MAX else -1.0  # maximiza sinal * f
+    gerador = GeradorAleatorio(semente).gerador
+
+    # Pontos iniciais aleatórios
+    x_atual = gerador.uniform(limites[0], limites[1], cadeias)
+    vl_atual = np.asarray(f(x_atual), dtype=float).copy()
+
+    melhor_x, melhor_val = x_atual.copy(), vl_atual.copy()
+
+    T = T_inicial
+
+    while T > T_final:
+        for _ in range(iteracoes):
+            # Gera um vizinho aleatório próximo para cada cadeia
+            x_novo = x_atual + gerador.uniform(-0.5, 0.5, cadeias)
+            dentro = (x_novo >= limites[0]) & (x_novo <= limites[1])
+            # Propostas fora dos limites são descartadas (não avaliadas)
+            vl_novo = np.copy(vl_atual)
+            vl_novo[dentro] = f(x_novo[dentro])
+            delta = sinal * (vl_novo - vl_atual)
+
+            # Critério de Metropolis (exp limitado a expoentes <= 0)
+            aceita = dentro & ((delta > 0) | (
+                np.exp(np.minimum(delta, 0.0) / T) > gerador.random(cadeias)))
+            x_atual[aceita] = x_novo[aceita]
+            vl_atual[aceita] = vl_novo[aceita]
+
+            # Atualiza melhor solução de cada cadeia
+            melhorou = aceita & (sinal * (vl_atual - melhor_val) > 0)
+            melhor_x[melhorou] = x_atual[melhorou]
+            melhor_val[melhorou] = vl_atual[melhorou]
+
+        # Resfriamento
+        T *= alpha
+
+    i = np.argmax(sinal * melhor_val)
+    return melhor_x[i], melhor_val[i], melhor_x, melhor_val
+
 # -----------------------------
 # Exemplos de execução:
 # -----------------------------
-x, valor = simulatedAnnealing(f1, limites=(0, 10), otimizador=MAX,
-                               T_inicial=100, T_final=1e-3, alpha=0.95, iteracoes=100)
-print(f"Simulated Annealing -> x = {x:.4f}, f(x) = {valor:.4f}")
+if __name__ == "__main__":
+    x, valor = simulatedAnnealing(f1, limites=(0, 10), otimizador=MAX,
+                                   T_inicial=100, T_final=1e-3, alpha=0.95, iteracoes=100)
+    print(f"Simulated Annealing -> x = {x:.4f}, f(x) = {valor:.4f}")
+
+    x, valor = simulatedAnnealing(f2, limites=(0, 10), otimizador=MIN,
+                                   T_inicial=100, T_final=1e-3, alpha=0.95, iteracoes=100)
+    print(f"Simulated Annealing -> x = {x:.4f}, f(x) = {valor:.4f}")
+
+    x, valor = simulatedAnnealing(f3, limites=(0, 10), otimizador=MAX,
+                                   T_inicial=100, T_final=1e-3, alpha=0.95, iteracoes=100)
+    print(f"Simulated Annealing -> x = {x:.4f}, f(x) = {valor:.4f}")
 
-x, valor = simulatedAnnealing(f2, limites=(0, 10), otimizador=MIN,
-                               T_inicial=100, T_final=1e-3, alpha=0.95, iteracoes=100)
-print(f"Simulated Annealing -> x = {x:.4f}, f(x) = {valor:.4f}")
+    x, valor, _, _ = simulatedAnnealingVetorizado(f3, cadeias=1000, limites=(0, 10),
+                                                  otimizador=MAX, T_inicial=100,
+                                                  T_final=1e-3, alpha=0.95,
+                                                  iteracoes=100)
+    print(f"SA vetorizado (1000 cadeias) -> x = {x:.4f}, f(x) = {valor:.4f}")
 
-x, valor = simulatedAnnealing(f3, limites=(0, 10), otimizador=MAX,
-                               T_inicial=100, T_final=1e-3, alpha=0.95, iteracoes=100)
-print(f"Simulated Annealing -> x = {x:.4f}, f(x) = {valor:.4f}")
+    x, valor = simulatedAnnealing(f3, limites=(0, 10), otimizador=MAX,
+                                   resfriamento=ResfriamentoAdaptativo(),
+                                   avaliacoes_max=5000, iteracoes=100)
+    print(f"SA adaptativo (5000 avaliações) -> x = {x:.4f}, f(x) = {valor:.4f}")
 
+    x, valor, taxas = parallelTempering(f3, limites=(0, 10), otimizador=MAX,
+                                        replicas=8, rodadas=50,
+                                        passos_troca=100, processos=4,
+                                        semente=42)
+    print(f"Parallel tempering -> x = {x:.4f}, f(x) = {valor:.4f}")
+    print("Taxas de troca:", ", ".join(f"{t:.2f}" for t in taxas))
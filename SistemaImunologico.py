@@ -1,7 +1,27 @@
-import random
-from copy import deepcopy
+import numpy as np
+from GeradorAleatorio import GeradorAleatorio, GERADOR_PADRAO
 import matplotlib.pyplot as plt
 
+# Número de genes (imagem 11 x 11) de antígenos e anticorpos
+TAMANHO = 121
+
+# Genes guardados como um inteiro de 121 bits (gene 0 no bit mais alto):
+# a afinidade é TAMANHO - popcount(antigeno XOR anticorpo)
+def empacota(genes):
+    # lista de 0/1 -> inteiro
+    return int("".join("1" if g else "0" for g in genes), 2)
+
+def empacota_matriz(matriz):
+    # matriz (n, TAMANHO) de 0/1 -> lista de n inteiros (np.packbits por linha)
+    bytes_linhas = np.packbits(np.asarray(matriz, dtype=bool), axis=1)
+    sobra = bytes_linhas.shape[1] * 8 - np.shape(matriz)[1]
+    return [int.from_bytes(linha.tobytes(), "big") >> sobra
+            for linha in bytes_linhas]
+
+def desempacota(bits, tamanho=TAMANHO):
+    # inteiro -> lista de 0/1
+    return [int(c) for c in format(bits, f"0{tamanho}b")]
+
 class Antigeno:
     def __init__(self):
         # em Java: new ArrayList(121)
@@ -17,6 +37,8 @@ class Antigeno:
         self.add_line(0,0,1,0,0,0,0,0,1,0,0)
         self.add_line(0,0,0,1,1,1,1,1,0,0,0)
         self.add_line(0,0,0,0,0,0,0,0,0,0,0)
+        # genes empacotados (ver empacota)
+        self.bits = empacota(self.um_antigeno)
 
     def add_line(self, x1, x2, x3, x4, x5,
                  x6, x7, x8, x9, x10, x11):
@@ -49,14 +71,28 @@ class Antigeno:
         return self.um_antigeno
 
 class Anticorpo:
-    def __init__(self):
-        self.um_anticorpo = []
-        for _ in range(121):
-            # 0 ou 1
-            valor = round(random.random())
-            self.um_anticorpo.append(valor)
+    def __init__(self, rng=None, bits=None):
+        if bits is None:
+            rng = rng if rng is not None else GERADOR_PADRAO
+            # 121 genes 0 ou 1 sorteados de uma vez
+            bits = empacota_matriz((rng.randoms((1, TAMANHO)) >= 0.5))[0]
+        self.bits = bits  # genes empacotados (ver empacota)
         self.afinidade = 0
 
+    # genes como lista de 0/1 (gerada a partir dos bits)
+    @property
+    def um_anticorpo(self):
+        return desempacota(self.bits)
+
+    @um_anticorpo.setter
+    def um_anticorpo(self, genes):
+        self.bits = empacota(genes)
+
+    def copia(self):
+        clone = Anticorpo(bits=self.bits)
+        clone.afinidade = self.afinidade
+        return clone
+
     # para poder ordenar como no Comparable 
     def __lt__(self, other):
         return self.afinidade > other.afinidade  # inverte para ordenar decrescente
@@ -84,36 +120,53 @@ class Anticorpo:
     def set_afinidade(self, valor):
         self.afinidade = valor
 
+def afinidade(um_anticorpo, dados):
+    # Afinidade para o Avaliador: genes iguais ao antígeno em dados["antigeno"]
+    return int(np.count_nonzero(np.asarray(um_anticorpo) == dados["antigeno"]))
+
 class SistemaImunologico:
-    def __init__(self, tam_populacao):
+    # avaliador: Avaliador opcional para calcular as afinidades de toda a
+    # população de uma vez, ex.: Avaliador(afinidade, PROCESSOS,
+    # dados={"antigeno": np.array(Antigeno().get_um_antigeno())})
+    def __init__(self, tam_populacao, semente=None, avaliador=None):
         self.populacao = tam_populacao
+        self.rng = GeradorAleatorio(semente)
+        self.avaliador = avaliador
         self.um_antigeno = Antigeno()
         self.anticorpos = self.cria_populacao()
 
     def cria_populacao(self, quantidade=None):
         if quantidade is None:
             quantidade = self.populacao
-        temp_anticorpos = []
-        for _ in range(quantidade):
-            temp_anticorpos.append(Anticorpo())
-        return temp_anticorpos
+        # genes de todos os novos anticorpos num único sorteio
+        sorteios = self.rng.randoms((quantidade, TAMANHO)) >= 0.5
+        return [Anticorpo(bits=bits) for bits in empacota_matriz(sorteios)]
+
+    def calcula_afinidades(self, anticorpos):
+        # afinidade de cada anticorpo: com avaliador, todos num único lote
+        if self.avaliador is not None:
+            valores = self.avaliador.avalia([a.get_um_anticorpo() for a in anticorpos])
+            for anticorpo, valor in zip(anticorpos, valores):
+                anticorpo.set_afinidade(valor)
+            return
+        # genes iguais = TAMANHO - bits diferentes (XOR + popcount)
+        antigeno = self.um_antigeno.bits
+        for anticorpo in anticorpos:
+            anticorpo.set_afinidade(TAMANHO - (antigeno ^ anticorpo.bits).bit_count())
 
     def afinidades(self):
-        for anticorpo in self.anticorpos:
-            anticorpo.set_afinidade(
-                self.fitness(self.um_antigeno.get_um_antigeno(),
-                             anticorpo.get_um_anticorpo())
-            )
+        self.calcula_afinidades(self.anticorpos)
         # ordenar decrescente de afinidade
         self.anticorpos.sort()
         return self.anticorpos
 
     def fitness(self, um_antigeno, um_anticorpo):
-        afinidade = 0
-        for a, b in zip(um_antigeno, um_anticorpo):
-            if a == b:
-                afinidade += 1
-        return afinidade
+        # aceita listas de genes ou genes já empacotados
+        if not isinstance(um_antigeno, int):
+            um_antigeno = empacota(um_antigeno)
+        if not isinstance(um_anticorpo, int):
+            um_anticorpo = empacota(um_anticorpo)
+        return TAMANHO - (um_antigeno ^ um_anticorpo).bit_count()
 
     def melhores(self, melhores_lista, quantidade):
         lista_melhores = []
@@ -137,7 +190,7 @@ class SistemaImunologico:
 
             cont = 0
             while cont < clonagens:
-                clones.append(deepcopy(m))
+                clones.append(m.copia())
                 cont += 1
 
         return clones
@@ -148,34 +201,22 @@ class SistemaImunologico:
         - quanto MENOR a afinidade, MAIOR a taxa de mutação
         - taxaHip = (1 - (afinidade / 121)) * fator
         """
-        antigeno = self.um_antigeno.get_um_antigeno()
-        hipermutados = []
-
-        for anticorpo in clones:
-            # afinidade atual desse anticorpo com o antígeno da classe
-            aff = self.fitness(antigeno, anticorpo.get_um_anticorpo())
-            taxa_hip = (1 - (aff / 121)) * fator
-
-            genes_orig = anticorpo.get_um_anticorpo()
-            novos_genes = []
-
-            for g in genes_orig:
-                rand = random.random()
-                if rand <= taxa_hip:
-                    # inverte bit
-                    if g == 0:
-                        novos_genes.append(1)
-                    else:
-                        novos_genes.append(0)
-                else:
-                    novos_genes.append(g)
-
-            # atualiza genes no próprio objeto
-            anticorpo.um_anticorpo = novos_genes
-            # recalcula afinidade após mutação
-            anticorpo.set_afinidade(self.fitness(antigeno, novos_genes))
-
-            hipermutados.append(anticorpo)
+        hipermutados = list(clones)
+
+        # afinidade atual de cada clone com o antígeno da classe
+        # (os clones copiam a afinidade já calculada do original)
+        afinidades = np.array([a.get_afinidade() for a in hipermutados], dtype=float)
+        taxas_hip = (1 - (afinidades / TAMANHO)) * fator
+
+        # sorteios de todos os genes de todos os clones de uma vez; os genes
+        # sorteados abaixo da taxa formam uma máscara que inverte os bits
+        sorteios = self.rng.randoms((len(hipermutados), TAMANHO))
+        mascaras = empacota_matriz(sorteios <= taxas_hip[:, None])
+        for anticorpo, mascara in zip(hipermutados, mascaras):
+            anticorpo.bits ^= mascara
+
+        # recalcula afinidade após mutação (todos os clones de uma vez)
+        self.calcula_afinidades(hipermutados)
 
         # se quiser manter ordenado já aqui:
         hipermutados.sort()